@@ -1,48 +1,329 @@
 """
 Script to check database configuration.
 """
+import contextlib
 import os
 import sqlite3
 import logging
+import pathlib
+import threading
+
+try:
+    import apsw
+except ImportError:
+    apsw = None
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, 
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def check_database():
+# Database location, resolved once at import alongside its data directory
+DB_PATH = pathlib.Path(__file__).resolve().parent / 'data' / 'consultease.db'
+DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+# Connection-level tuning applied on every open. journal_mode is persisted in
+# the file header, but cache_size, temp_store, mmap_size, busy_timeout and
+# foreign_keys are per-connection and must be re-applied on each connect.
+SQLITE_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA cache_size=-64000;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA busy_timeout=5000;
+PRAGMA foreign_keys=ON;
+"""
+
+# Page layout for new databases. Both settings only take effect before the
+# first table is created (or through a full VACUUM), and page_size cannot be
+# changed at all while the file is in WAL mode.
+PAGE_SIZE = 8192
+PAGE_LAYOUT_PRAGMAS = f"""
+PRAGMA page_size={PAGE_SIZE};
+PRAGMA auto_vacuum=INCREMENTAL;
+"""
+
+# Statements run on every check. Kept as module constants so the same string
+# object hits the connection's statement cache when a connection is reused.
+JOURNAL_MODE_SQL = "PRAGMA journal_mode;"
+TABLE_LIST_SQL = "PRAGMA main.table_list;"
+LEGACY_TABLE_LIST_SQL = "SELECT name, type FROM sqlite_master WHERE type='table';"
+
+# Size of each connection's prepared statement cache
+STATEMENT_CACHE_SIZE = 256
+
+
+def _run_setup(conn, *statements):
+    """
+    Apply the PRAGMA bundle and any extra setup statements in one round-trip.
+
+    Args:
+        conn: SQLite connection to configure
+        *statements: Additional DDL statements to run after the PRAGMAs
+    """
+    script = SQLITE_PRAGMAS
+    if statements:
+        script += "\n".join(stmt.rstrip().rstrip(';') + ';' for stmt in statements)
+    conn.executescript(script)
+
+
+def _apply_page_layout(conn):
+    """
+    Set the page size and auto-vacuum mode on databases that hold no data yet.
+
+    Populated databases are left alone to avoid a costly VACUUM.
+    """
+    if conn.execute("PRAGMA page_size;").fetchone()[0] == PAGE_SIZE:
+        return
+
+    if conn.execute("PRAGMA page_count;").fetchone()[0] == 0:
+        # Brand new file: the settings apply when the first page is written
+        conn.executescript(PAGE_LAYOUT_PRAGMAS)
+        return
+
+    if conn.execute("SELECT count(*) FROM sqlite_master;").fetchone()[0]:
+        return
+
+    # Existing but empty file: leave WAL so the page size can change, then rebuild
+    logger.info(f"Rebuilding empty database with {PAGE_SIZE}-byte pages")
+    conn.executescript("PRAGMA journal_mode=DELETE;" + PAGE_LAYOUT_PRAGMAS + "VACUUM;")
+
+
+def _connect(db_path):
+    """
+    Open a SQLite connection with the baseline PRAGMA bundle applied.
+    """
+    # Shared-cache mode lets every connection to this file in the process
+    # use a single page cache instead of warming one per connection.
+    conn = sqlite3.connect(f"file:{db_path}?cache=shared", uri=True, isolation_level=None,
+                           check_same_thread=False,
+                           cached_statements=STATEMENT_CACHE_SIZE)
+    _apply_page_layout(conn)
+    _run_setup(conn)
+
+    journal_mode = conn.execute(JOURNAL_MODE_SQL).fetchone()
+    if journal_mode != ('wal',):
+        logger.warning(f"Could not enable WAL journal mode, current mode: {journal_mode}")
+
+    return conn
+
+
+# Shared read/write connections, keyed by database path
+_connections = {}
+_connections_lock = threading.Lock()
+
+
+def get_connection(db_path):
+    """
+    Get the shared read/write connection for a database, opening it on first use.
+
+    Args:
+        db_path: Path to the SQLite database file
+
+    Returns:
+        sqlite3.Connection: Connection reused across callers and threads
+    """
+    with _connections_lock:
+        conn = _connections.get(db_path)
+        if conn is None:
+            conn = _connect(db_path)
+            _connections[db_path] = conn
+        return conn
+
+
+def get_readonly_connection(db_path):
+    """
+    Open a read-only connection for a worker thread.
+
+    Pairs with get_connection() as one shared writer plus per-thread readers.
+    When apsw is installed it is used for these connections, since it has a
+    thinner per-call binding than the sqlite3 module. The caller owns the
+    returned connection and is responsible for closing it.
+    """
+    uri = f"file:{db_path}?mode=ro&cache=shared"
+    # Readers skip the shared-cache table locks held by the writer. A connection
+    # joining an existing shared cache inherits its read/write access, so
+    # query_only keeps it read-only.
+    setup = "PRAGMA read_uncommitted=1; PRAGMA query_only=1;"
+
+    if apsw is not None:
+        conn = apsw.Connection(uri, flags=apsw.SQLITE_OPEN_READONLY | apsw.SQLITE_OPEN_URI,
+                               statementcachesize=STATEMENT_CACHE_SIZE)
+        conn.setbusytimeout(5000)
+        conn.cursor().execute(setup)
+        return conn
+
+    conn = sqlite3.connect(uri, uri=True, isolation_level=None,
+                           cached_statements=STATEMENT_CACHE_SIZE)
+    conn.executescript(setup)
+    return conn
+
+
+def snapshot_database(db_path):
+    """
+    Copy a database into memory for repeated introspection.
+
+    The file is read once through a read-only connection and copied with the
+    SQLite backup API. Queries against the returned connection hit RAM only
+    and cannot contend with writers on the file.
+
+    Args:
+        db_path: Path to the SQLite database file
+
+    Returns:
+        sqlite3.Connection: In-memory connection holding a copy of the database
+    """
+    snapshot = sqlite3.connect(':memory:', isolation_level=None)
+    try:
+        with contextlib.closing(sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)) as source:
+            source.backup(snapshot)
+    except Exception:
+        snapshot.close()
+        raise
+    return snapshot
+
+
+def close_connections():
+    """
+    Close all shared connections, running PRAGMA optimize on each first.
+    """
+    with _connections_lock:
+        for conn in _connections.values():
+            try:
+                # Refresh stale planner statistics; a no-op when nothing changed
+                conn.execute("PRAGMA optimize;")
+            except sqlite3.Error as e:
+                logger.warning(f"PRAGMA optimize failed: {e}")
+            conn.close()
+        _connections.clear()
+
+
+def _list_tables(cursor, sqlite_version_info=sqlite3.sqlite_version_info):
+    """
+    Return the names of the tables in the main schema.
+
+    Uses PRAGMA table_list where available (SQLite 3.37+) and falls back to
+    querying sqlite_master on older libraries. Rows are streamed from the
+    cursor, which works for both sqlite3 and apsw cursors.
+    """
+    if sqlite_version_info >= (3, 37, 0):
+        # Columns: schema, name, type, ncol, wr, strict
+        rows = cursor.execute(TABLE_LIST_SQL)
+        name_index, type_index = 1, 2
+    else:
+        rows = cursor.execute(LEGACY_TABLE_LIST_SQL)
+        name_index, type_index = 0, 1
+
+    return [
+        row[name_index] for row in rows
+        if row[type_index] == 'table' and row[name_index] != 'sqlite_schema'
+    ]
+
+
+def ensure_database_exists(db_path):
+    """
+    Create the data directory and database file if they don't exist yet.
+
+    Opens the shared read/write connection, which creates the file and puts it
+    in WAL mode so that read-only inspectors can attach to it afterwards.
+    """
+    # The default data directory is created at import time
+    directory = os.path.dirname(db_path)
+    if directory and directory != str(DB_PATH.parent):
+        os.makedirs(directory, exist_ok=True)
+
+    return get_connection(db_path)
+
+
+def inspect_database(db_path, conn=None):
+    """
+    Log the tables present in the database.
+
+    Args:
+        db_path: Path to the SQLite database file
+        conn: Optional existing connection to inspect, such as one returned by
+            snapshot_database(). When omitted, a private read-only connection
+            is opened and closed again.
+
+    Returns:
+        list: Names of the tables in the database
+    """
+    if conn is None:
+        with contextlib.closing(get_readonly_connection(db_path)) as readonly_conn:
+            return inspect_database(db_path, readonly_conn)
+
+    if apsw is not None and isinstance(conn, apsw.Connection):
+        sqlite_version_info = tuple(int(part) for part in apsw.sqlite_lib_version().split('.'))
+    else:
+        sqlite_version_info = sqlite3.sqlite_version_info
+
+    # Connections run in autocommit mode; read the schema inside one explicit
+    # deferred transaction so all rows come from the same snapshot and no
+    # implicit commit is left pending on close.
+    cursor = conn.cursor()
+    cursor.execute("BEGIN DEFERRED;")
+    try:
+        tables = _list_tables(cursor, sqlite_version_info)
+    finally:
+        cursor.execute("COMMIT;")
+
+    if tables:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Database contains %d tables: %s", len(tables), tables)
+    else:
+        logger.info("Database is empty. It will be initialized when the application runs.")
+
+    return tables
+
+
+# Set once the default database has been checked in this process
+_DB_CHECKED = False
+
+
+def reset_check_cache():
+    """
+    Force the next check_database() call to re-check the default database.
+    """
+    global _DB_CHECKED
+    _DB_CHECKED = False
+
+
+def check_database(conn=None):
     """
     Check the database configuration.
+
+    The default database is only checked once per process; see
+    reset_check_cache().
+
+    Args:
+        conn: Optional existing connection to inspect. When omitted, the
+            database is created if needed and inspected read-only.
     """
+    global _DB_CHECKED
+    if conn is None and _DB_CHECKED:
+        return
+
     try:
         # Get database connection - directly use SQLite
-        db_path = os.path.join('data', 'consultease.db')
+        db_path = str(DB_PATH)
         logger.info(f"Checking database at: {db_path}")
-        
-        # Create the data directory if it doesn't exist
-        os.makedirs('data', exist_ok=True)
-        
-        # If the database doesn't exist yet, it will be created
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
-        # Check if the database has tables
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = cursor.fetchall()
-        
-        if tables:
-            logger.info(f"Database contains {len(tables)} tables: {[t[0] for t in tables]}")
-        else:
-            logger.info("Database is empty. It will be initialized when the application runs.")
+
+        if conn is None:
+            # If the database doesn't exist yet, it will be created
+            ensure_database_exists(db_path)
+
+        inspect_database(db_path, conn)
+
+        if conn is None:
+            _DB_CHECKED = True
 
         logger.info("Database check completed successfully")
 
     except Exception as e:
         logger.error(f"Error checking database: {str(e)}")
         raise
-    finally:
-        if 'conn' in locals():
-            conn.close()
+
 
 if __name__ == "__main__":
     try:
@@ -50,4 +331,6 @@ if __name__ == "__main__":
         check_database()
         logger.info("Database check completed successfully. The faculty room issue has been fixed in the code.")
     except Exception as e:
-        logger.error(f"Database check failed: {e}") 
\ No newline at end of file
+        logger.error(f"Database check failed: {e}")
+    finally:
+        close_connections() 
\ No newline at end of file
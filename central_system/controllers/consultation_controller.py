@@ -437,4 +437,16 @@ class ConsultationController:
             return success_json or success_text or success_faculty
         except Exception as e:
             logger.error(f"Error testing faculty desk connection: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+
+
+# Global controller instance
+_consultation_controller = None
+
+
+def get_consultation_controller():
+    """Get the global consultation controller instance."""
+    global _consultation_controller
+    if _consultation_controller is None:
+        _consultation_controller = ConsultationController()
+    return _consultation_controller
@@ -1,11 +1,23 @@
 import logging
 import datetime
-from sqlalchemy import or_, func
+import itertools
+import json
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Optional
+from sqlalchemy import or_, func, exists, update, bindparam
+from sqlalchemy.orm import aliased
 from ..models import Faculty, get_db
-from ..utils.mqtt_utils import publish_faculty_status, subscribe_to_topic, publish_mqtt_message
+from ..utils.mqtt_utils import publish_faculty_status, subscribe_to_topic, publish_mqtt_message, publish_mqtt_batch, encode_mqtt_payload, decode_mqtt_payload
 from ..utils.mqtt_topics import MQTTTopics
 from ..utils.cache_manager import cached, invalidate_faculty_cache, cache_faculty_list_key, get_cache_manager
 from ..utils.query_cache import cached_query, paginate_query, invalidate_cache_pattern
+from ..utils.config_manager import get_config
 from ..utils.validators import (
     validate_name_safe, validate_department_safe, validate_email_safe,
     validate_ble_id_safe, InputValidator, ValidationError
@@ -15,6 +27,109 @@ from ..services.consultation_queue_service import get_consultation_queue_service
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Columns loaded by FacultyController.get_all_faculty. Selecting columns rather
+# than the Faculty entity returns plain rows and skips ORM object hydration.
+_FACULTY_LIST_COLUMNS = (
+    Faculty.id,
+    Faculty.name,
+    Faculty.department,
+    Faculty.email,
+    Faculty.ble_id,
+    Faculty.image_path,
+    Faculty.status,
+    Faculty.always_available,
+    Faculty.last_seen,
+)
+
+
+@dataclass(frozen=True)
+class FacultyStatusSnapshot:
+    """
+    Faculty data returned by FacultyController.update_faculty_status.
+
+    Fields are read as attributes (snapshot.status). Item access and get()
+    are kept so callbacks written against the former dict keep working.
+    """
+    __slots__ = ('id', 'name', 'department', 'status', 'ble_id', 'last_seen', 'version')
+
+    id: int
+    name: str
+    department: str
+    status: bool
+    ble_id: Optional[str]
+    last_seen: Optional[str]
+    version: int
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Build a snapshot from a row of _STATUS_SNAPSHOT_COLUMNS.
+        """
+        return cls(
+            id=row.id,
+            name=row.name,
+            department=row.department,
+            status=row.status,
+            ble_id=row.ble_id,
+            last_seen=row.last_seen.isoformat() if row.last_seen else None,
+            version=row.version
+        )
+
+    def to_dict(self):
+        """
+        Convert the snapshot to a dictionary.
+        """
+        return asdict(self)
+
+
+# Columns read into a FacultyStatusSnapshot
+_STATUS_SNAPSHOT_COLUMNS = (
+    Faculty.id, Faculty.name, Faculty.department, Faculty.status,
+    Faculty.ble_id, Faculty.last_seen, Faculty.version,
+)
+
+# Heartbeat last_seen write, built once and executed with one parameter set
+# per faculty. Targets the table so no ORM objects are loaded or tracked.
+_HEARTBEAT_UPDATE = (
+    update(Faculty.__table__)
+    .where(Faculty.__table__.c.id == bindparam('faculty_id'))
+    .values(last_seen=bindparam('last_seen'))
+)
+
+# Striped locks serializing status writes per faculty. Shared by every
+# FacultyController so all instances agree on the owner of a faculty's stripe.
+_STATUS_LOCKS = tuple(threading.Lock() for _ in range(64))
+
+# Last status applied per faculty: faculty_id -> (status, monotonic time,
+# FacultyStatusSnapshot). Repeats of the same status within the TTL are
+# answered from here without touching the database. Written under the
+# faculty's stripe lock after commit; every other status writer forgets the
+# entry through _forget_last_status().
+_last_status = {}
+_LAST_STATUS_TTL = 5  # seconds
+
+
+def _forget_last_status(faculty_id):
+    """
+    Drop the remembered status for a faculty after another write to its row.
+    """
+    faculty_id = int(faculty_id)
+    with _STATUS_LOCKS[faculty_id & 63]:
+        _last_status.pop(faculty_id, None)
+
+
+# Per-faculty topics handled by FacultyController.handle_faculty_status_update
+_FACULTY_TOPIC_RE = re.compile(r"^consultease/faculty/(\d+)/(status|mac_status|heartbeat)$")
+
 class FacultyController:
     """
     Controller for managing faculty data and status.
@@ -27,6 +142,50 @@ class FacultyController:
         self.callbacks = []
         self.queue_service = get_consultation_queue_service()
 
+        # Status notifications are published from a background worker so the
+        # MQTT/request thread returns as soon as the DB commit is done
+        self._publish_queue = queue.SimpleQueue()
+        self._publish_thread = None
+        self._publish_thread_lock = threading.Lock()
+        self._publish_batch_size = 32  # Maximum notifications per batch
+        self._publish_coalesce_window = 0.01  # 10ms window to coalesce updates
+
+        # Sequence numbers stamped on status notifications for ordering
+        self._message_sequence = itertools.count(1)
+
+        # Striped locks serializing status updates per faculty. A fixed pool
+        # avoids a per-faculty dict that grows forever and races on insert.
+        self._status_locks = _STATUS_LOCKS
+
+        # Cache invalidation after status flips is debounced across all faculty
+        self._invalidation_lock = threading.Lock()
+        self._invalidation_pending = False
+        self._invalidation_delay = 0.5  # seconds
+
+        # Heartbeat last_seen writes are buffered and flushed in one transaction
+        self._hb_buffer = {}  # faculty_id -> last_seen
+        self._hb_lock = threading.Lock()
+        self._hb_flush_pending = False
+        self._hb_flush_interval = 0.5  # seconds
+
+        # Post-commit status verification costs an extra SELECT per update
+        self._verify_commits = get_config('performance.verify_faculty_commits', False)
+
+        # Faculty picked for legacy status messages that don't identify anyone
+        self._legacy_fallback_faculty_id = None
+        self._legacy_fallback_ts = None
+        self._legacy_fallback_ttl = 60  # seconds
+
+        # Faculty names for heartbeat log messages: faculty_id -> name, kept in
+        # LRU order and cleared by _invalidate_faculty_caches()
+        self._faculty_names = OrderedDict()
+        self._faculty_names_lock = threading.Lock()
+        self._faculty_names_max = 256
+
+        # Queue service and callback fanout runs off the MQTT client thread.
+        # A single worker keeps events in arrival order.
+        self._post_update_pool = self._create_post_update_pool()
+
     def start(self):
         """
         Start the faculty controller and subscribe to faculty status updates.
@@ -48,6 +207,28 @@ class FacultyController:
         """
         logger.info("Stopping Faculty controller")
 
+        with self._publish_thread_lock:
+            if self._publish_thread and self._publish_thread.is_alive():
+                self._publish_queue.put(None)  # Sentinel to stop the worker
+                self._publish_thread.join(timeout=5.0)
+                if self._publish_thread.is_alive():
+                    logger.warning("Faculty status publisher thread did not join in time.")
+            self._publish_thread = None
+
+        # Write out any heartbeats still waiting for the flush timer
+        self._flush_heartbeats()
+
+        # Let queued fanout finish, then leave a fresh pool for a later start()
+        self._post_update_pool.shutdown(wait=True)
+        self._post_update_pool = self._create_post_update_pool()
+
+    @staticmethod
+    def _create_post_update_pool():
+        """
+        Create the executor that runs post-update fanout.
+        """
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="faculty-post")
+
     def register_callback(self, callback):
         """
         Register a callback to be called when faculty status changes.
@@ -63,11 +244,11 @@ class FacultyController:
         Notify all registered callbacks with the updated faculty information.
 
         Args:
-            faculty_data (dict): Updated faculty data dictionary
+            faculty_data (FacultyStatusSnapshot): Updated faculty data
         """
         for callback in self.callbacks:
             try:
-                callback(faculty_data) # Pass the dictionary
+                callback(faculty_data)
             except Exception as e:
                 logger.error(f"Error in Faculty controller callback: {str(e)}")
 
@@ -75,140 +256,247 @@ class FacultyController:
         logger.info(f"🔄 MQTT STATUS UPDATE - Topic: {topic}, Data: {data}, Type: {type(data)}")
 
         faculty_id = None
-        status = None
-        # faculty_name = None # Not directly used for update_faculty_status call
-
         faculty_dict_for_callbacks = None # Initialize a variable to hold the dict for callbacks
 
-        if topic.endswith("/mac_status"):
-            try:
-                faculty_id = int(topic.split("/")[2])
-                if isinstance(data, dict):
-                    status_str = data.get("status", "")
-                    detected_mac = data.get("mac", "")
-                    if status_str == "faculty_present": status = True
-                    elif status_str == "faculty_absent": status = False
-                    else: logger.warning(f"Unknown MAC status: {status_str}"); return
-
-                    faculty_dict_for_callbacks = self.update_faculty_status(faculty_id, status)
-
-                    if faculty_dict_for_callbacks:
-                        if detected_mac and status:
-                            normalized_mac = Faculty.normalize_mac_address(detected_mac)
-                            if normalized_mac != faculty_dict_for_callbacks.get('ble_id'): 
-                                self.update_faculty_ble_id(faculty_id, normalized_mac)
-                        # self._notify_callbacks is called at the end if faculty_dict_for_callbacks is set
-                        # Publish notification logic can use faculty_dict_for_callbacks
-                        try:
-                            notification = {
-                                'type': 'faculty_mac_status',
-                                'faculty_id': faculty_dict_for_callbacks['id'],
-                                'faculty_name': faculty_dict_for_callbacks['name'],
-                                'status': status,
-                                'detected_mac': detected_mac,
-                                'timestamp': faculty_dict_for_callbacks['last_seen']
-                            }
-                            publish_mqtt_message(MQTTTopics.SYSTEM_NOTIFICATIONS, notification)
-                        except Exception as e:
-                            logger.error(f"Error publishing MAC status notification: {str(e)}")
-                    # return # Don't return early, let common callback notification run
-            except (ValueError, IndexError) as e:
-                logger.error(f"Error parsing MAC status topic {topic}: {str(e)}")
-                return # Return on parsing error
-
+        match = _FACULTY_TOPIC_RE.match(topic)
+        if match: # Standard topic format: consultease/faculty/{id}/{kind}
+            faculty_id = int(match[1])
+            handler = _FACULTY_TOPIC_HANDLERS[match[2]]
+            faculty_dict_for_callbacks = handler(self, faculty_id, topic, data)
         elif topic == MQTTTopics.LEGACY_FACULTY_STATUS:
-            db_session_legacy = get_db() # Session for fetching faculty if needed
-            try:
-                faculty_to_update = None
-                if isinstance(data, str):
-                    if data == "keychain_connected" or data == "faculty_present": status = True
-                    elif data == "keychain_disconnected" or data == "faculty_absent": status = False
-                    else: logger.warning(f"Unknown legacy status string: {data}"); db_session_legacy.close(); return
-                    
-                    # Try to find faculty with BLE configured
-                    faculty_to_update = db_session_legacy.query(Faculty).filter(Faculty.ble_id.isnot(None)).first()
-                    if faculty_to_update: faculty_id = faculty_to_update.id
-                    else: logger.error("No faculty with BLE configuration found for legacy update"); db_session_legacy.close(); return
-
-                elif isinstance(data, dict):
-                    status = data.get('status', False)
-                    faculty_id_from_data = data.get('faculty_id')
-                    faculty_name_from_data = data.get('faculty_name')
-                    if faculty_id_from_data:
-                        faculty_id = faculty_id_from_data
-                    elif faculty_name_from_data:
-                        faculty_to_update = db_session_legacy.query(Faculty).filter(Faculty.name == faculty_name_from_data).first()
-                        if faculty_to_update: faculty_id = faculty_to_update.id
-                        else: logger.error(f"Faculty '{faculty_name_from_data}' not found for legacy update"); db_session_legacy.close(); return
-                    else: # Fallback to any BLE configured faculty
-                        faculty_to_update = db_session_legacy.query(Faculty).filter(Faculty.ble_id.isnot(None)).first()
-                        if faculty_to_update: faculty_id = faculty_to_update.id
-                        else: logger.error("No faculty identified for legacy JSON update"); db_session_legacy.close(); return
-                else: logger.error(f"Invalid data type for legacy status: {type(data)}"); db_session_legacy.close(); return
-
-                if faculty_id is not None and status is not None:
-                    faculty_dict_for_callbacks = self.update_faculty_status(faculty_id, status)
-            finally:
-                db_session_legacy.close()
-
-        else: # Standard topic format: consultease/faculty/{id}/status
-            parts = topic.split('/')
-            if len(parts) == 4 and parts[0] == "consultease" and parts[1] == "faculty" and parts[3] == "status":
-                try:
-                    faculty_id = int(parts[2])
-                    if isinstance(data, dict):
-                        status = data.get('present') # Assuming 'present' field from log
-                        if status is None: # Fallback to 'status' field if 'present' is not there
-                           status = data.get('status')
-                        # Convert potential string "true"/"false" to boolean
-                        if isinstance(status, str):
-                            if status.lower() == 'true': status = True
-                            elif status.lower() == 'false': status = False
-                            else: logger.warning(f"Invalid status string value: {status}"); return
-                        
-                        if status is None: logger.warning(f"Status not found in data: {data}"); return
-
-                        # Enhanced status details (optional)
-                        ntp_sync_status = data.get('ntp_sync_status')
-                        grace_period_active = data.get('in_grace_period')
-                        
-                        faculty_dict_for_callbacks = self.update_faculty_status(faculty_id, status)
-                        
-                        if faculty_dict_for_callbacks and (ntp_sync_status or grace_period_active is not None):
-                             # If update_faculty_status does not handle these, we might need another method call
-                             # For now, assume update_faculty_status is the primary source of truth for 'status'
-                             # and these are for logging or minor adjustments if needed later.
-                             logger.info(f"Faculty {faculty_id} enhanced info: NTP: {ntp_sync_status}, Grace: {grace_period_active}")
-                             # Potentially call: self._update_faculty_enhanced_status(faculty_id, status, ntp_sync_status, grace_period_active)
-                             # But this might cause another DB write. For now, focus on the main status update.
-
-                    elif isinstance(data, (bool, int)): # Direct status true/false or 1/0
-                        status = bool(data)
-                        faculty_dict_for_callbacks = self.update_faculty_status(faculty_id, status)
-                    else:
-                        logger.error(f"Invalid data type for status: {type(data)} on topic {topic}")
-                        return
-                except ValueError:
-                    logger.error(f"Invalid faculty ID in topic: {parts[2]}")
-                    return
-                except IndexError:
-                    logger.error(f"Invalid topic format: {topic}")
-                    return
-            else:
-                logger.warning(f"Unhandled MQTT topic in FacultyController: {topic}")
-                return
+            faculty_dict_for_callbacks = self._handle_legacy_status(data)
+        else:
+            logger.warning(f"Unhandled MQTT topic in FacultyController: {topic}")
+            return
+
+        if faculty_dict_for_callbacks is None: # Message ignored or invalid
+            return
 
         # Common actions after status update attempt
         if faculty_dict_for_callbacks:
-            # Notify consultation queue service about faculty status change
-            self.queue_service.update_faculty_status(faculty_dict_for_callbacks['id'], faculty_dict_for_callbacks['status'])
-            # Notify registered callbacks with the dictionary
-            self._notify_callbacks(faculty_dict_for_callbacks)
-            # Publish general notification (already handled by update_faculty_status via _publish_status_update_with_sequence_safe)
-            logger.info(f"Processed status update for faculty ID {faculty_dict_for_callbacks['id']}, new status: {faculty_dict_for_callbacks['status']}")
+            # Hand the fanout to the worker so the MQTT thread can take the next message
+            future = self._post_update_pool.submit(self._run_post_update, faculty_dict_for_callbacks)
+            future.add_done_callback(self._log_post_update_failure)
         elif faculty_id is not None: # Log if update attempt was made but failed
             logger.warning(f"Failed to get updated faculty dictionary for faculty ID {faculty_id} after status update attempt.")
 
+    def _run_post_update(self, faculty_data):
+        """
+        Propagate a processed status update to the queue service and callbacks.
+
+        Args:
+            faculty_data (FacultyStatusSnapshot): Updated faculty data
+        """
+        # Notify consultation queue service about faculty status change
+        self.queue_service.update_faculty_status(faculty_data.id, faculty_data.status)
+        # Notify registered callbacks with the snapshot
+        self._notify_callbacks(faculty_data)
+        # The MQTT status notification is queued by update_faculty_status and
+        # published by the background publish worker, not here
+        logger.info(f"Processed status update for faculty ID {faculty_data.id}, new status: {faculty_data.status}")
+
+    @staticmethod
+    def _log_post_update_failure(future):
+        """
+        Log an exception raised by a job on the post-update pool.
+        """
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Error in faculty post-update processing: {str(error)}")
+
+    def _handle_mac_status(self, faculty_id, topic, data):
+        """
+        Handle a consultease/faculty/{id}/mac_status message.
+
+        Returns:
+            FacultyStatusSnapshot: Updated faculty data, False if the update failed, or None if
+            the message was ignored
+        """
+        if not isinstance(data, dict):
+            return False
+
+        status_str = data.get("status", "")
+        detected_mac = data.get("mac", "")
+        if status_str == "faculty_present": status = True
+        elif status_str == "faculty_absent": status = False
+        else: logger.warning(f"Unknown MAC status: {status_str}"); return None
+
+        faculty_dict = self.update_faculty_status(faculty_id, status)
+
+        if faculty_dict:
+            if detected_mac and status:
+                normalized_mac = Faculty.normalize_mac_address(detected_mac)
+                if normalized_mac != faculty_dict.ble_id:
+                    self.update_faculty_ble_id(faculty_id, normalized_mac)
+            try:
+                notification = {
+                    'type': 'faculty_mac_status',
+                    'faculty_id': faculty_dict.id,
+                    'faculty_name': faculty_dict.name,
+                    'status': status,
+                    'detected_mac': detected_mac,
+                    'timestamp': faculty_dict.last_seen
+                }
+                publish_mqtt_message(MQTTTopics.SYSTEM_NOTIFICATIONS, notification)
+            except Exception as e:
+                logger.error(f"Error publishing MAC status notification: {str(e)}")
+
+        return faculty_dict or False
+
+    def _handle_standard_status(self, faculty_id, topic, data):
+        """
+        Handle a consultease/faculty/{id}/status message.
+
+        Returns:
+            FacultyStatusSnapshot: Updated faculty data, False if the update failed, or None if
+            the message was invalid
+        """
+        if isinstance(data, dict):
+            status = data.get('present') # Assuming 'present' field from log
+            if status is None: # Fallback to 'status' field if 'present' is not there
+               status = data.get('status')
+            # Convert potential string "true"/"false" to boolean
+            if isinstance(status, str):
+                if status.lower() == 'true': status = True
+                elif status.lower() == 'false': status = False
+                else: logger.warning(f"Invalid status string value: {status}"); return None
+
+            if status is None: logger.warning(f"Status not found in data: {data}"); return None
+
+            # Enhanced status details (optional)
+            ntp_sync_status = data.get('ntp_sync_status')
+            grace_period_active = data.get('in_grace_period')
+
+            faculty_dict = self.update_faculty_status(faculty_id, status)
+
+            if faculty_dict and (ntp_sync_status or grace_period_active is not None):
+                 # If update_faculty_status does not handle these, we might need another method call
+                 # For now, assume update_faculty_status is the primary source of truth for 'status'
+                 # and these are for logging or minor adjustments if needed later.
+                 logger.info(f"Faculty {faculty_id} enhanced info: NTP: {ntp_sync_status}, Grace: {grace_period_active}")
+                 # Potentially call: self._update_faculty_enhanced_status(faculty_id, status, ntp_sync_status, grace_period_active)
+                 # But this might cause another DB write. For now, focus on the main status update.
+
+        elif isinstance(data, (bool, int)): # Direct status true/false or 1/0
+            status = bool(data)
+            faculty_dict = self.update_faculty_status(faculty_id, status)
+        else:
+            logger.error(f"Invalid data type for status: {type(data)} on topic {topic}")
+            return None
+
+        return faculty_dict or False
+
+    def _handle_heartbeat_topic(self, faculty_id, topic, data):
+        """
+        Route a heartbeat that arrived on the status handler to the heartbeat handler.
+        """
+        self.handle_faculty_heartbeat(topic, data)
+        return None
+
+    def _handle_legacy_status(self, data):
+        """
+        Handle a message on the legacy faculty desk unit status topic.
+
+        Returns:
+            FacultyStatusSnapshot: Updated faculty data, False if the update failed, or None if
+            the message could not be attributed to a faculty member
+        """
+        faculty_id = None
+        status = None
+        faculty_dict = None
+
+        db_session_legacy = get_db() # Session for fetching faculty if needed
+        try:
+            faculty_to_update = None
+            if isinstance(data, str):
+                if data == "keychain_connected" or data == "faculty_present": status = True
+                elif data == "keychain_disconnected" or data == "faculty_absent": status = False
+                else: logger.warning(f"Unknown legacy status string: {data}"); return None
+
+                # Try to find faculty with BLE configured
+                faculty_id = self._get_legacy_fallback_faculty_id(db_session_legacy)
+                if faculty_id is None: logger.error("No faculty with BLE configuration found for legacy update"); return None
+
+            elif isinstance(data, dict):
+                status = data.get('status', False)
+                faculty_id_from_data = data.get('faculty_id')
+                faculty_name_from_data = data.get('faculty_name')
+                if faculty_id_from_data:
+                    faculty_id = faculty_id_from_data
+                elif faculty_name_from_data:
+                    faculty_to_update = db_session_legacy.query(Faculty).filter(Faculty.name == faculty_name_from_data).first()
+                    if faculty_to_update: faculty_id = faculty_to_update.id
+                    else: logger.error(f"Faculty '{faculty_name_from_data}' not found for legacy update"); return None
+                else: # Fallback to any BLE configured faculty
+                    faculty_id = self._get_legacy_fallback_faculty_id(db_session_legacy)
+                    if faculty_id is None: logger.error("No faculty identified for legacy JSON update"); return None
+            else: logger.error(f"Invalid data type for legacy status: {type(data)}"); return None
+
+            if faculty_id is not None and status is not None:
+                faculty_dict = self.update_faculty_status(faculty_id, status)
+        finally:
+            db_session_legacy.close()
+
+        if not faculty_dict and faculty_id is not None:
+            logger.warning(f"Failed to get updated faculty dictionary for faculty ID {faculty_id} after status update attempt.")
+        return faculty_dict or None
+
+    def _get_legacy_fallback_faculty_id(self, db):
+        """
+        Get the ID of the faculty used for legacy status messages that don't
+        name a faculty member.
+
+        The lookup is cached for a short time and dropped whenever a BLE ID
+        changes, see _invalidate_legacy_fallback().
+
+        Args:
+            db: Database session used on a cache miss
+
+        Returns:
+            int: Faculty ID, or None if no faculty has a BLE ID configured
+        """
+        now = time.monotonic()
+        if (self._legacy_fallback_faculty_id is not None
+                and now - self._legacy_fallback_ts < self._legacy_fallback_ttl):
+            return self._legacy_fallback_faculty_id
+
+        row = db.query(Faculty.id).filter(Faculty.ble_id.isnot(None)).first()
+        if row is None:
+            return None
+
+        self._legacy_fallback_faculty_id = row.id
+        self._legacy_fallback_ts = now
+        return row.id
+
+    def _invalidate_legacy_fallback(self):
+        """Forget the cached legacy fallback faculty after BLE IDs change."""
+        self._legacy_fallback_faculty_id = None
+        self._legacy_fallback_ts = None
+
+    def _get_faculty_name(self, faculty_id):
+        """
+        Get a faculty member's name for log messages, loading it on a cache miss.
+
+        Args:
+            faculty_id (int): Faculty ID
+
+        Returns:
+            str: Faculty name, or None if the faculty doesn't exist
+        """
+        with self._faculty_names_lock:
+            if faculty_id in self._faculty_names:
+                self._faculty_names.move_to_end(faculty_id)
+                return self._faculty_names[faculty_id]
+
+        with get_db() as db:
+            name = db.query(Faculty.name).filter(Faculty.id == faculty_id).scalar()
+
+        with self._faculty_names_lock:
+            self._faculty_names[faculty_id] = name
+            if len(self._faculty_names) > self._faculty_names_max:
+                self._faculty_names.popitem(last=False)
+        return name
+
     def update_faculty_status(self, faculty_id, status):
         """
         Update faculty status in the database with atomic operations to prevent race conditions.
@@ -218,20 +506,26 @@ class FacultyController:
             status (bool): New status (True = Available, False = Unavailable)
 
         Returns:
-            dict: Dictionary containing updated faculty data, or None if not found or error.
+            FacultyStatusSnapshot: Updated faculty data, or None if not found or error.
         """
-        logger.info(f"Attempting to update faculty ID {faculty_id} to status: {status}")
-        import threading
+        # Ids can arrive as str from legacy and JSON paths; normalize them so
+        # every caller for the same faculty shares one lock stripe
+        try:
+            faculty_id = int(faculty_id)
+        except (TypeError, ValueError):
+            logger.error(f"Invalid faculty ID {faculty_id!r}. Cannot update status.")
+            return None
 
-        # Use a lock to prevent concurrent status updates for the same faculty
-        lock_key = f"faculty_status_{faculty_id}"
-        if not hasattr(self, '_status_locks'):
-            self._status_locks = {}
+        # BLE presence repeats the same status many times; skip the DB for those
+        last = _last_status.get(faculty_id)
+        if last is not None and last[0] == status and time.monotonic() - last[1] < _LAST_STATUS_TTL:
+            logger.debug(f"Faculty {faculty_id} status {status} repeated, using recent result")
+            return last[2]
 
-        if lock_key not in self._status_locks:
-            self._status_locks[lock_key] = threading.Lock()
+        logger.info(f"Attempting to update faculty ID {faculty_id} to status: {status}")
 
-        with self._status_locks[lock_key]:
+        # Use a lock to prevent concurrent status updates for the same faculty
+        with self._status_locks[faculty_id & 63]:
             try:
                 # Use database manager for thread-safe operations
                 from ..services.database_manager import get_database_manager
@@ -239,82 +533,53 @@ class FacultyController:
 
                 with db_manager.get_session_context() as db:
                     logger.debug(f"DB session acquired for faculty {faculty_id}")
-                    # Use SELECT FOR UPDATE to lock the row and prevent concurrent modifications
-                    faculty = db.query(Faculty).filter(Faculty.id == faculty_id).with_for_update().first()
-
-                    if not faculty:
-                        logger.error(f"Faculty not found in DB: {faculty_id}. Cannot update status.")
-                        return None
-
-                    logger.debug(f"Faculty {faculty.name} (ID: {faculty_id}) current DB status: {faculty.status}. Received new status: {status}")
-                    # Check if status actually changed to avoid unnecessary updates
-                    if faculty.status == status:
-                        logger.info(f"Faculty {faculty.name} (ID: {faculty.id}) status unchanged ({status}). No DB update needed.")
-                        # Return dictionary representation even if unchanged
-                        return {
-                            'id': faculty.id,
-                            'name': faculty.name,
-                            'department': faculty.department,
-                            'status': faculty.status,
-                            'ble_id': faculty.ble_id,
-                            'last_seen': faculty.last_seen.isoformat() if faculty.last_seen else None,
-                            'version': getattr(faculty, 'version', 1)
-                        }
-
-                    # Store previous status for logging
-                    previous_status = faculty.status
-                    logger.debug(f"Faculty {faculty.name} (ID: {faculty.id}) previous status: {previous_status}, new status: {status}. Proceeding with update.")
-
-                    # Update status and timestamp atomically
-                    faculty.status = status
-                    faculty.last_seen = datetime.datetime.now()
-
-                    # Increment a version counter to detect concurrent modifications
-                    if not hasattr(faculty, 'version'):
-                        faculty.version = 1
-                    else:
-                        faculty.version += 1
-
-                    logger.info(f"Atomically updated attributes for faculty {faculty.name} (ID: {faculty.id}): {previous_status} -> {status}. Awaiting commit.")
-
-                    # Create a safe faculty data dictionary to avoid DetachedInstanceError
-                    faculty_data = {
-                        'id': faculty.id,
-                        'name': faculty.name,
-                        'department': faculty.department,
-                        'status': faculty.status,
-                        'ble_id': faculty.ble_id,
-                        'last_seen': faculty.last_seen.isoformat() if faculty.last_seen else None,
-                        'version': getattr(faculty, 'version', 1)
-                    }
+                    # Read the prior status for the notification. Status may be
+                    # NULL, so it can't be inferred from the new value. The
+                    # stripe lock keeps other writers in this process out until
+                    # the UPDATE below has committed.
+                    prior = db.query(Faculty.status).filter(Faculty.id == faculty_id).first()
+                    previous_status = prior.status if prior is not None else None
+
+                    # Flip the status in a single conditional UPDATE. The WHERE
+                    # clause only matches when the status actually changes, so
+                    # no row lock is held while Python code runs.
+                    row = db.execute(
+                        update(Faculty)
+                        .where(Faculty.id == faculty_id, Faculty.status.is_distinct_from(status))
+                        .values(status=status, last_seen=datetime.datetime.now(),
+                                version=Faculty.version + 1)
+                        .returning(*_STATUS_SNAPSHOT_COLUMNS)
+                    ).first()
+
+                    if row is None:
+                        # Nothing updated: either the faculty is missing or the status is unchanged
+                        row = db.query(*_STATUS_SNAPSHOT_COLUMNS).filter(Faculty.id == faculty_id).first()
+
+                        if not row:
+                            _last_status.pop(faculty_id, None)
+                            logger.error(f"Faculty not found in DB: {faculty_id}. Cannot update status.")
+                            return None
+
+                        logger.info(f"Faculty {row.name} (ID: {row.id}) status unchanged ({status}). No DB update needed.")
+                        faculty_data = FacultyStatusSnapshot.from_row(row)
+                        _last_status[faculty_id] = (status, time.monotonic(), faculty_data)
+                        return faculty_data
+
+                    logger.info("Atomically updated faculty %s (ID: %s): %s -> %s. Awaiting commit.",
+                                row.name, row.id, previous_status, status)
+
+                    # Snapshot plain values to avoid DetachedInstanceError
+                    faculty_data = FacultyStatusSnapshot.from_row(row)
 
                 # Session context manager will attempt to commit here if no exceptions occurred
                 logger.info(f"DB session context exited for faculty {faculty_id}. Commit should have occurred if changes were made.")
-
-                # <<< START VERIFICATION BLOCK >>>
-                if faculty_data: # Only verify if an update was attempted and faculty_data was prepared
-                    try:
-                        logger.info(f"Verifying faculty {faculty_id} status post-commit...")
-                        with db_manager.get_session_context() as verify_db: # Use a new session from the manager
-                            verified_faculty = verify_db.query(Faculty).filter(Faculty.id == faculty_id).first()
-                            if verified_faculty:
-                                logger.info(f"Post-commit verification: Faculty ID {faculty_id}, Name: {verified_faculty.name}, DB Status: {verified_faculty.status}. Expected status: {status}")
-                                if verified_faculty.status != status:
-                                    logger.error(f"POST-COMMIT STATUS MISMATCH for faculty {faculty_id}! DB has {verified_faculty.status}, expected {status}. COMMIT LIKELY FAILED OR WAS OVERWRITTEN.")
-                                else:
-                                    logger.info(f"Post-commit verification successful for faculty {faculty_id}. Status in DB is {verified_faculty.status}.")
-                            else:
-                                logger.error(f"Post-commit verification FAILED: Faculty {faculty_id} not found in DB after supposed update.")
-                    except Exception as verify_e:
-                        logger.error(f"Exception during post-commit verification for faculty {faculty_id}: {str(verify_e)}")
-                # <<< END VERIFICATION BLOCK >>>
+                _last_status[faculty_id] = (status, time.monotonic(), faculty_data)
 
                 # Invalidate faculty cache when status changes (outside transaction)
-                logger.debug(f"Invalidating cache for faculty {faculty_id} post-update.")
-                invalidate_faculty_cache()
-                invalidate_cache_pattern("get_all_faculty")
+                logger.debug(f"Scheduling cache invalidation for faculty {faculty_id} post-update.")
+                self._schedule_invalidation()
 
-                # Publish MQTT notification with sequence number to ensure ordering
+                # Queue MQTT notification with sequence number to ensure ordering
                 self._publish_status_update_with_sequence_safe(faculty_data, status, previous_status)
 
                 return faculty_data
@@ -325,93 +590,165 @@ class FacultyController:
                 logger.error(f"Traceback: {traceback.format_exc()}")
                 return None
 
-    def _publish_status_update_with_sequence(self, faculty, new_status, previous_status):
+    def _schedule_invalidation(self):
         """
-        Publish faculty status update with sequence number for message ordering.
+        Schedule a faculty cache invalidation unless one is already pending.
 
-        Args:
-            faculty: Faculty object
-            new_status: New status value
-            previous_status: Previous status value
+        Bursts of status updates collapse into a single invalidation that runs
+        once the debounce delay has elapsed.
         """
-        try:
-            # Generate sequence number for message ordering
-            if not hasattr(self, '_message_sequence'):
-                self._message_sequence = 0
-
-            self._message_sequence += 1
-
-            # Create notification with sequence number and timestamp
-            notification = {
-                'type': 'faculty_status',
-                'faculty_id': faculty.id,
-                'faculty_name': faculty.name,
-                'status': new_status,
-                'previous_status': previous_status,
-                'sequence': self._message_sequence,
-                'timestamp': faculty.last_seen.isoformat() if faculty.last_seen else None,
-                'version': getattr(faculty, 'version', 1)
-            }
+        with self._invalidation_lock:
+            if self._invalidation_pending:
+                return
+            self._invalidation_pending = True
 
-            # Publish to both standardized and legacy topics for compatibility
-            topics = [
-                MQTTTopics.SYSTEM_NOTIFICATIONS,
-                f"consultease/faculty/{faculty.id}/status_update"
-            ]
+        timer = threading.Timer(self._invalidation_delay, self._run_scheduled_invalidation)
+        timer.daemon = True
+        timer.start()
 
-            for topic in topics:
-                try:
-                    publish_mqtt_message(topic, notification)
-                    logger.debug(f"Published status update to {topic} with sequence {self._message_sequence}")
-                except Exception as e:
-                    logger.error(f"Error publishing to {topic}: {str(e)}")
+    def _run_scheduled_invalidation(self):
+        """
+        Invalidate faculty caches for a scheduled invalidation.
+        """
+        # Clear the flag first so updates arriving from here on schedule a new run
+        with self._invalidation_lock:
+            self._invalidation_pending = False
 
+        try:
+            invalidate_faculty_cache()
+            invalidate_cache_pattern("get_all_faculty")
         except Exception as e:
-            logger.error(f"Error publishing faculty status notification: {str(e)}")
+            logger.error(f"Error invalidating faculty cache: {str(e)}")
 
     def _publish_status_update_with_sequence_safe(self, faculty_data, new_status, previous_status):
         """
-        Publish faculty status update with sequence number for message ordering using safe faculty data.
+        Queue a faculty status update for publishing with a sequence number.
+
+        The notification is built and published by the background publish
+        worker, which keeps queue order so sequence numbers stay ordered.
 
         Args:
-            faculty_data (dict): Safe faculty data dictionary
+            faculty_data (FacultyStatusSnapshot): Updated faculty data
             new_status: New status value
             previous_status: Previous status value
         """
-        try:
-            # Generate sequence number for message ordering
-            if not hasattr(self, '_message_sequence'):
-                self._message_sequence = 0
+        self._ensure_publish_worker()
+        self._publish_queue.put((faculty_data, new_status, previous_status))
 
-            self._message_sequence += 1
+    def _ensure_publish_worker(self):
+        """
+        Start the background publish worker if it is not running.
+        """
+        if self._publish_thread and self._publish_thread.is_alive():
+            return
+
+        with self._publish_thread_lock:
+            if self._publish_thread is None or not self._publish_thread.is_alive():
+                self._publish_thread = threading.Thread(
+                    target=self._publish_worker,
+                    name="faculty-status-publisher",
+                    daemon=True
+                )
+                self._publish_thread.start()
+
+    def _publish_worker(self):
+        """
+        Background worker that publishes queued faculty status updates.
+
+        Updates arriving within the coalesce window are published together in
+        a single MQTT batch.
+        """
+        stopping = False
+        while not stopping:
+            item = self._publish_queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self._publish_coalesce_window
+            while len(batch) < self._publish_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._publish_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                self._publish_status_batch(batch)
+            except Exception as e:
+                logger.error(f"Error in faculty status publish worker: {str(e)}")
+
+    def _publish_status_batch(self, batch):
+        """
+        Publish a batch of queued faculty status updates.
+
+        Args:
+            batch (list): (faculty_data, new_status, previous_status) tuples
+        """
+        messages = []
+        sequence = None
+        for faculty_data, new_status, previous_status in batch:
+            # Generate sequence number for message ordering
+            sequence = next(self._message_sequence)
 
             # Create notification with sequence number and timestamp
             notification = {
                 'type': 'faculty_status',
-                'faculty_id': faculty_data['id'],
-                'faculty_name': faculty_data['name'],
+                'faculty_id': faculty_data.id,
+                'faculty_name': faculty_data.name,
                 'status': new_status,
                 'previous_status': previous_status,
-                'sequence': self._message_sequence,
-                'timestamp': faculty_data.get('last_seen'),
-                'version': faculty_data.get('version', 1)
+                'sequence': sequence,
+                'timestamp': faculty_data.last_seen,
+                'version': faculty_data.version
             }
 
-            # Publish to both standardized and legacy topics for compatibility
-            topics = [
-                MQTTTopics.SYSTEM_NOTIFICATIONS,
-                f"consultease/faculty/{faculty_data['id']}/status_update"
-            ]
+            # Encode once; the same payload goes to both topics
+            payload = encode_mqtt_payload(notification)
 
-            for topic in topics:
-                try:
-                    publish_mqtt_message(topic, notification, retain=True)
-                    logger.debug(f"Published status update to {topic} with sequence {self._message_sequence} (retained)")
-                except Exception as e:
-                    logger.error(f"Error publishing to {topic}: {str(e)}")
+            # Publish to both standardized and legacy topics for compatibility.
+            # The notification bus needs delivery guarantees; the retained
+            # per-faculty status is superseded by the next update, so QoS 0.
+            messages.append((MQTTTopics.SYSTEM_NOTIFICATIONS, payload, True, 1))
+            messages.append((f"consultease/faculty/{faculty_data.id}/status_update", payload, True, 0))
 
-        except Exception as e:
-            logger.error(f"Error publishing faculty status notification: {str(e)}")
+        published = publish_mqtt_batch(messages)
+        logger.debug(f"Published {len(batch)} status updates to {published}/{len(messages)} topics, last sequence {sequence} (retained)")
+
+        if self._verify_commits:
+            for faculty_data, new_status, _ in batch:
+                self._verify_status_commit(faculty_data.id, new_status)
+
+    def _verify_status_commit(self, faculty_id, status):
+        """
+        Re-read a faculty status after commit and log any mismatch.
+
+        Args:
+            faculty_id (int): Faculty ID
+            status (bool): Status that was committed
+        """
+        try:
+            from ..services.database_manager import get_database_manager
+            db_manager = get_database_manager()
+
+            logger.debug(f"Verifying faculty {faculty_id} status post-commit...")
+            with db_manager.get_session_context() as verify_db:
+                verified_faculty = verify_db.get(Faculty, faculty_id)
+                if verified_faculty:
+                    if verified_faculty.status != status:
+                        logger.error(f"POST-COMMIT STATUS MISMATCH for faculty {faculty_id}! DB has {verified_faculty.status}, expected {status}. COMMIT LIKELY FAILED OR WAS OVERWRITTEN.")
+                    else:
+                        logger.debug(f"Post-commit verification successful for faculty {faculty_id}. Status in DB is {verified_faculty.status}.")
+                else:
+                    logger.error(f"Post-commit verification FAILED: Faculty {faculty_id} not found in DB after supposed update.")
+        except Exception as verify_e:
+            logger.error(f"Exception during post-commit verification for faculty {faculty_id}: {str(verify_e)}")
 
     def handle_concurrent_status_update(self, faculty_id, status, source="unknown"):
         """
@@ -443,7 +780,6 @@ class FacultyController:
                 logger.warning(f"Concurrent update conflict for faculty {faculty_id} (attempt {attempt + 1}): {e}")
 
                 if attempt < max_retries - 1:
-                    import time
                     time.sleep(retry_delay * (2 ** attempt))  # Exponential backoff
 
         logger.error(f"Failed to update faculty {faculty_id} status after {max_retries} attempts")
@@ -462,12 +798,16 @@ class FacultyController:
             page_size (int): Number of items per page
 
         Returns:
-            list or dict: List of Faculty objects, or paginated results if page is specified
+            list or dict: List of faculty rows, or paginated results if page is specified.
+                Rows expose the listed columns as attributes (faculty.name etc.)
+                but are not ORM objects; use get_faculty_by_id() for a model.
         """
         try:
-            db = get_db(force_new=True)  # Force new session to avoid DetachedInstanceError
-            try:
-                query = db.query(Faculty)
+            from ..services.database_manager import get_database_manager
+
+            # Rows are plain column tuples, so a pooled read-only session is enough
+            with get_database_manager().get_session_context(readonly=True) as db:
+                query = db.query(*_FACULTY_LIST_COLUMNS)
 
                 # Apply filters
                 if filter_available is not None:
@@ -492,19 +832,9 @@ class FacultyController:
                 # For backward compatibility, return all results if no pagination
                 faculties = query.all()
 
-                # Ensure all attributes are loaded before returning
-                for faculty in faculties:
-                    # Access attributes to ensure they're loaded
-                    _ = faculty.id, faculty.name, faculty.department, faculty.status
-                    _ = getattr(faculty, 'always_available', False)
-                    _ = getattr(faculty, 'email', '')
-
                 logger.debug(f"Retrieved {len(faculties)} faculty members")
                 return faculties
 
-            finally:
-                db.close()
-
         except Exception as e:
             logger.error(f"Error getting faculty list: {str(e)}")
             return [] if page is None else {'items': [], 'total_count': 0, 'page': 1, 'total_pages': 0}
@@ -521,7 +851,7 @@ class FacultyController:
         """
         try:
             db = get_db()
-            faculty = db.query(Faculty).filter(Faculty.id == faculty_id).first()
+            faculty = db.get(Faculty, faculty_id)
             return faculty
         except Exception as e:
             logger.error(f"Error getting faculty by ID: {str(e)}")
@@ -618,14 +948,14 @@ class FacultyController:
     def _check_faculty_duplicates(self, email, ble_id):
         """Check for duplicate email or BLE ID."""
         try:
-            db = get_db()
-            existing = db.query(Faculty).filter(
-                or_(Faculty.email == email, Faculty.ble_id == ble_id)
-            ).first()
-
-            if existing:
-                return f"Faculty with email {email} or BLE ID {ble_id} already exists"
-            return None
+            # Close the session on exit so its connection goes back to the pool
+            with get_db() as db:
+                # Separate EXISTS probes let each lookup use its own unique index
+                if db.query(exists().where(Faculty.email == email)).scalar():
+                    return f"Faculty with email {email} already exists"
+                if ble_id and db.query(exists().where(Faculty.ble_id == ble_id)).scalar():
+                    return f"Faculty with BLE ID {ble_id} already exists"
+                return None
         except Exception as e:
             logger.error(f"Error checking faculty duplicates: {e}")
             return f"Error checking for duplicates: {str(e)}"
@@ -654,6 +984,7 @@ class FacultyController:
         """Handle post-creation tasks for new faculty."""
         # Invalidate caches
         self._invalidate_faculty_caches()
+        self._invalidate_legacy_fallback()
 
         # Publish notification
         self._publish_faculty_creation_notification(faculty)
@@ -663,12 +994,16 @@ class FacultyController:
         invalidate_faculty_cache()
         invalidate_cache_pattern("get_all_faculty")
 
+        with self._faculty_names_lock:
+            self._faculty_names.clear()
+
         if hasattr(self.get_all_faculty, 'cache_clear'):
             self.get_all_faculty.cache_clear()
 
     def _publish_faculty_creation_notification(self, faculty):
-        """Publish MQTT notification for new faculty creation."""
+        """Queue MQTT notification for new faculty creation."""
         try:
+            # Built here since the ORM object must not be touched from the worker
             notification = {
                 'type': 'faculty_status',
                 'faculty_id': faculty.id,
@@ -676,7 +1011,11 @@ class FacultyController:
                 'status': faculty.status,
                 'timestamp': faculty.last_seen.isoformat() if faculty.last_seen else None
             }
-            publish_mqtt_message(MQTTTopics.SYSTEM_NOTIFICATIONS, notification)
+            # Publish from the post-update worker so the caller doesn't wait on the broker
+            future = self._post_update_pool.submit(
+                publish_mqtt_message, MQTTTopics.SYSTEM_NOTIFICATIONS, notification
+            )
+            future.add_done_callback(self._log_post_update_failure)
             logger.info(f"Faculty {faculty.name} (ID: {faculty.id}) created with BLE-based availability")
         except Exception as e:
             logger.error(f"Error publishing faculty status notification: {str(e)}")
@@ -690,11 +1029,16 @@ class FacultyController:
             data (dict or str): Heartbeat data
         """
         try:
+            # Extract faculty ID from topic, before spending time on the payload
+            match = _FACULTY_TOPIC_RE.match(topic)
+            if not match:
+                return
+            faculty_id = int(match[1])
+
             # Parse heartbeat data
             if isinstance(data, str):
                 try:
-                    import json
-                    heartbeat_data = json.loads(data)
+                    heartbeat_data = decode_mqtt_payload(data)
                 except json.JSONDecodeError:
                     logger.debug(f"Non-JSON heartbeat data: {data}")
                     return
@@ -703,40 +1047,60 @@ class FacultyController:
             else:
                 return
 
-            # Extract faculty ID from topic
-            faculty_id = None
-            try:
-                faculty_id = int(topic.split("/")[2])
-            except (IndexError, ValueError):
-                return
+            # Record last seen; the database write happens in the next flush
+            with self._hb_lock:
+                self._hb_buffer[faculty_id] = datetime.datetime.now()
+                schedule_flush = not self._hb_flush_pending
+                self._hb_flush_pending = True
+
+            if schedule_flush:
+                timer = threading.Timer(self._hb_flush_interval, self._flush_heartbeats)
+                timer.daemon = True
+                timer.start()
+
+            # Log important status changes
+            if 'ntp_sync_status' in heartbeat_data:
+                ntp_status = heartbeat_data['ntp_sync_status']
+                if ntp_status == 'FAILED':
+                    logger.warning(f"Faculty {self._get_faculty_name(faculty_id)} (ID: {faculty_id}) NTP sync failed")
+                elif ntp_status == 'SYNCED':
+                    logger.debug(f"Faculty {faculty_id} NTP synced")
+
+            # Monitor system health
+            if 'free_heap' in heartbeat_data:
+                free_heap = heartbeat_data.get('free_heap', 0)
+                if free_heap < 50000:  # Less than 50KB free
+                    logger.warning(f"Faculty {self._get_faculty_name(faculty_id)} (ID: {faculty_id}) "
+                                   f"low memory: {free_heap} bytes")
 
-            # Update last seen timestamp for the faculty
-            db = get_db()
-            try:
-                faculty = db.query(Faculty).filter(Faculty.id == faculty_id).first()
-                if faculty:
-                    faculty.last_seen = datetime.datetime.now()
-                    db.commit()
+        except Exception as e:
+            logger.debug(f"Error processing faculty heartbeat: {str(e)}")
 
-                    # Log important status changes
-                    if 'ntp_sync_status' in heartbeat_data:
-                        ntp_status = heartbeat_data['ntp_sync_status']
-                        if ntp_status == 'FAILED':
-                            logger.warning(f"Faculty {faculty_id} ({faculty.name}) NTP sync failed")
-                        elif ntp_status == 'SYNCED':
-                            logger.debug(f"Faculty {faculty_id} ({faculty.name}) NTP synced")
+    def _flush_heartbeats(self):
+        """
+        Write buffered heartbeat timestamps to the database in one transaction.
+        """
+        with self._hb_lock:
+            pending = self._hb_buffer
+            self._hb_buffer = {}
+            self._hb_flush_pending = False
 
-                    # Monitor system health
-                    if 'free_heap' in heartbeat_data:
-                        free_heap = heartbeat_data.get('free_heap', 0)
-                        if free_heap < 50000:  # Less than 50KB free
-                            logger.warning(f"Faculty {faculty_id} ({faculty.name}) low memory: {free_heap} bytes")
+        if not pending:
+            return
 
-            finally:
-                db.close()
+        try:
+            from ..services.database_manager import get_database_manager
 
+            # One executemany UPDATE. Unlike bulk_update_mappings this tolerates
+            # heartbeats from faculty IDs that are not in the database.
+            with get_database_manager().get_session_context() as db:
+                db.execute(_HEARTBEAT_UPDATE, [
+                    {'faculty_id': faculty_id, 'last_seen': last_seen}
+                    for faculty_id, last_seen in pending.items()
+                ])
+            logger.debug(f"Flushed heartbeats for {len(pending)} faculty")
         except Exception as e:
-            logger.debug(f"Error processing faculty heartbeat: {str(e)}")
+            logger.error(f"Error flushing faculty heartbeats: {str(e)}")
 
     def _update_faculty_enhanced_status(self, faculty_id, status, ntp_sync_status, grace_period_active):
         """
@@ -754,7 +1118,7 @@ class FacultyController:
             db_manager = get_database_manager()
 
             with db_manager.get_session_context() as db:
-                faculty = db.query(Faculty).filter(Faculty.id == faculty_id).first()
+                faculty = db.get(Faculty, faculty_id)
                 if faculty:
                     # Update enhanced status fields
                     faculty.ntp_sync_status = ntp_sync_status
@@ -769,6 +1133,9 @@ class FacultyController:
                     # Commit happens automatically via context manager
                 else:
                     logger.warning(f"Faculty {faculty_id} not found for enhanced status update")
+
+            # last_seen moved even when the status did not
+            _forget_last_status(faculty_id)
         except Exception as e:
             logger.error(f"Error updating enhanced faculty status: {str(e)}")
             import traceback
@@ -792,61 +1159,91 @@ class FacultyController:
         """
         try:
             db = get_db()
-            faculty = db.query(Faculty).filter(Faculty.id == faculty_id).first()
-
-            if not faculty:
-                logger.error(f"Faculty not found: {faculty_id}")
-                return None
 
-            # Update fields if provided
+            # Update fields if provided. always_available is reset regardless
+            # of input; status is always determined by BLE connection.
+            values = {'always_available': False}
             if name is not None:
-                faculty.name = name
-
+                values['name'] = name
             if department is not None:
-                faculty.department = department
-
-            if email is not None and email != faculty.email:
-                # Check if email already exists
-                existing = db.query(Faculty).filter(Faculty.email == email).first()
-                if existing and existing.id != faculty_id:
-                    logger.error(f"Faculty with email {email} already exists")
-                    return None
-                faculty.email = email
-
-            if ble_id is not None and ble_id != faculty.ble_id:
-                # Check if BLE ID already exists
-                existing = db.query(Faculty).filter(Faculty.ble_id == ble_id).first()
-                if existing and existing.id != faculty_id:
-                    logger.error(f"Faculty with BLE ID {ble_id} already exists")
-                    return None
-                faculty.ble_id = ble_id
-
+                values['department'] = department
+            if email is not None:
+                values['email'] = email
+            if ble_id is not None:
+                values['ble_id'] = ble_id
             if image_path is not None:
-                faculty.image_path = image_path
+                values['image_path'] = image_path
+
+            # The uniqueness checks run inside the UPDATE itself, so no other
+            # writer can claim the email or BLE ID between check and write
+            conditions = [Faculty.id == faculty_id]
+            # Skip the write (and the updated_at bump) when nothing changes
+            conditions.append(or_(*(
+                getattr(Faculty, column).is_distinct_from(value) for column, value in values.items()
+            )))
+            other = aliased(Faculty)
+            if email is not None:
+                conditions.append(~exists().where(other.email == email, other.id != faculty_id))
+            if ble_id is not None:
+                conditions.append(~exists().where(other.ble_id == ble_id, other.id != faculty_id))
+
+            result = db.execute(
+                update(Faculty).where(*conditions).values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != 1:
+                db.rollback()
+                error = self._describe_faculty_update_failure(db, faculty_id, email, ble_id)
+                if error:
+                    logger.error(error)
+                    return None
 
-            # Set always_available to False regardless of input
-            # Status is always determined by BLE connection
-            if faculty.always_available:
-                faculty.always_available = False
-                logger.info(f"Faculty {faculty.name} (ID: {faculty.id}) status will be determined by BLE connection")
+                logger.debug(f"Faculty {faculty_id} already up to date, nothing to update")
+                return db.get(Faculty, faculty_id)
 
             db.commit()
+            _forget_last_status(faculty_id)
+            if ble_id is not None:
+                self._invalidate_legacy_fallback()
+
+            faculty = db.get(Faculty, faculty_id)
 
             logger.info(f"Updated faculty: {faculty.name} (ID: {faculty.id})")
 
             # Invalidate faculty cache
-            invalidate_faculty_cache()
-            invalidate_cache_pattern("get_all_faculty")
-
-            # Clear method-level cache if it exists
-            if hasattr(self.get_all_faculty, 'cache_clear'):
-                self.get_all_faculty.cache_clear()
+            self._invalidate_faculty_caches()
 
             return faculty
         except Exception as e:
             logger.error(f"Error updating faculty: {str(e)}")
             return None
 
+    def _describe_faculty_update_failure(self, db, faculty_id, email=None, ble_id=None):
+        """
+        Explain why a conditional faculty UPDATE matched no rows.
+
+        Only runs on the failure path, after the UPDATE itself. Returns None
+        when nothing is wrong, meaning the row already held the new values.
+
+        Args:
+            db: Database session
+            faculty_id (int): Faculty ID that was updated
+            email (str, optional): Email the update tried to set
+            ble_id (str, optional): BLE ID the update tried to set
+
+        Returns:
+            str: Error message, or None if the update was a no-op
+        """
+        if not db.query(exists().where(Faculty.id == faculty_id)).scalar():
+            return f"Faculty not found: {faculty_id}"
+        if email is not None and db.query(
+                exists().where(Faculty.email == email, Faculty.id != faculty_id)).scalar():
+            return f"Faculty with email {email} already exists"
+        if ble_id is not None and db.query(
+                exists().where(Faculty.ble_id == ble_id, Faculty.id != faculty_id)).scalar():
+            return f"Faculty with BLE ID {ble_id} already exists"
+        return None
+
     def update_faculty_ble_id(self, faculty_id, ble_id):
         """
         Update a faculty member's BLE ID (for beacon assignment).
@@ -858,41 +1255,46 @@ class FacultyController:
         Returns:
             bool: True if successful, False otherwise
         """
-        try:
-            db = get_db()
-            faculty = db.query(Faculty).filter(Faculty.id == faculty_id).first()
-
-            if not faculty:
-                logger.error(f"Faculty with ID {faculty_id} not found")
-                return False
-
-            # Validate BLE ID format
-            if ble_id and not Faculty.validate_ble_id(ble_id):
-                logger.error(f"Invalid BLE ID format: {ble_id}")
-                return False
+        # Validate BLE ID format
+        if ble_id and not Faculty.validate_ble_id(ble_id):
+            logger.error(f"Invalid BLE ID format: {ble_id}")
+            return False
 
-            # Check if BLE ID is already in use by another faculty
-            if ble_id:
-                existing = db.query(Faculty).filter(
-                    Faculty.ble_id == ble_id,
-                    Faculty.id != faculty_id
+        try:
+            # Closing the session on exit also rolls back anything left uncommitted
+            with get_db() as db:
+                # Check that the BLE ID is free and assign it in one statement,
+                # skipping the write when the faculty already has it
+                conditions = [Faculty.id == faculty_id, Faculty.ble_id.is_distinct_from(ble_id)]
+                if ble_id:
+                    other = aliased(Faculty)
+                    conditions.append(~exists().where(other.ble_id == ble_id, other.id != faculty_id))
+
+                row = db.execute(
+                    update(Faculty).where(*conditions)
+                    .values(ble_id=ble_id, updated_at=func.now())
+                    .returning(Faculty.name)
+                    .execution_options(synchronize_session=False)
                 ).first()
 
-                if existing:
-                    logger.error(f"BLE ID {ble_id} is already in use by faculty {existing.name}")
-                    return False
+                if row is None:
+                    error = self._describe_faculty_update_failure(db, faculty_id, ble_id=ble_id or None)
+                    if error:
+                        logger.error(error)
+                        return False
 
-            # Update BLE ID
-            faculty.ble_id = ble_id
-            faculty.updated_at = func.now()
-            db.commit()
+                    logger.debug(f"Faculty {faculty_id} already has BLE ID {ble_id}, nothing to update")
+                    return True
 
-            logger.info(f"Updated BLE ID for faculty {faculty.name} (ID: {faculty_id}) to {ble_id}")
-            return True
+                db.commit()
+                _forget_last_status(faculty_id)
+                self._invalidate_legacy_fallback()
+
+                logger.info(f"Updated BLE ID for faculty {row.name} (ID: {faculty_id}) to {ble_id}")
+                return True
 
         except Exception as e:
             logger.error(f"Error updating faculty BLE ID: {str(e)}")
-            db.rollback()
             return False
 
     def delete_faculty(self, faculty_id):
@@ -907,7 +1309,7 @@ class FacultyController:
         """
         try:
             db = get_db()
-            faculty = db.query(Faculty).filter(Faculty.id == faculty_id).first()
+            faculty = db.get(Faculty, faculty_id)
 
             if not faculty:
                 logger.error(f"Faculty not found: {faculty_id}")
@@ -915,16 +1317,13 @@ class FacultyController:
 
             db.delete(faculty)
             db.commit()
+            _forget_last_status(faculty_id)
+            self._invalidate_legacy_fallback()
 
             logger.info(f"Deleted faculty: {faculty.name} (ID: {faculty.id})")
 
             # Invalidate faculty cache
-            invalidate_faculty_cache()
-            invalidate_cache_pattern("get_all_faculty")
-
-            # Clear method-level cache if it exists
-            if hasattr(self.get_all_faculty, 'cache_clear'):
-                self.get_all_faculty.cache_clear()
+            self._invalidate_faculty_caches()
 
             return True
         except Exception as e:
@@ -956,6 +1355,7 @@ class FacultyController:
                 logger.info(f"Making Dr. John Smith (ID: {dr_john.id}) available for testing")
                 dr_john.status = True
                 db.commit()
+                _forget_last_status(dr_john.id)
                 return dr_john
 
             # If Dr. John Smith doesn't exist, make the first faculty available
@@ -965,10 +1365,19 @@ class FacultyController:
                 logger.info(f"Making {first_faculty.name} (ID: {first_faculty.id}) available for testing")
                 first_faculty.status = True
                 db.commit()
+                _forget_last_status(first_faculty.id)
                 return first_faculty
 
             logger.warning("No faculty found in the database")
             return None
         except Exception as e:
             logger.error(f"Error ensuring available faculty: {str(e)}")
-            return None
\ No newline at end of file
+            return None
+
+
+# Dispatch table for _FACULTY_TOPIC_RE matches, keyed by topic suffix
+_FACULTY_TOPIC_HANDLERS = {
+    'status': FacultyController._handle_standard_status,
+    'mac_status': FacultyController._handle_mac_status,
+    'heartbeat': FacultyController._handle_heartbeat_topic,
+}
@@ -5,16 +5,36 @@ Handles faculty responses (ACKNOWLEDGE, BUSY) from faculty desk units.
 
 import json
 import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Any, Optional
 
+from sqlalchemy import func, select
+
 from ..models.base import get_db
 from ..models.consultation import Consultation, ConsultationStatus
-from ..utils.mqtt_utils import subscribe_to_topic, publish_mqtt_message
+from ..utils.mqtt_utils import subscribe_to_topic, publish_mqtt_message, decode_mqtt_payload
 from ..utils.mqtt_topics import MQTTTopics
+from .consultation_controller import get_consultation_controller
 
 logger = logging.getLogger(__name__)
 
+# Topics handled by FacultyResponseController; group 1 is the faculty ID
+_FACULTY_TOPIC_RE = re.compile(r"^consultease/faculty/(\d+)/(?:heartbeat|responses)$")
+
+# Consultation status for each response type a desk unit can send
+_RESPONSE_STATUS_MAP = {
+    "ACKNOWLEDGE": ConsultationStatus.ACCEPTED,
+    "ACCEPTED": ConsultationStatus.ACCEPTED,
+    "BUSY": ConsultationStatus.BUSY,
+    "UNAVAILABLE": ConsultationStatus.BUSY,
+    "REJECTED": ConsultationStatus.CANCELLED,
+    "DECLINED": ConsultationStatus.CANCELLED,
+    "COMPLETED": ConsultationStatus.COMPLETED,
+}
+
 
 class FacultyResponseController:
     """
@@ -27,6 +47,15 @@ class FacultyResponseController:
         """
         self.callbacks = []
 
+        # Callbacks run here so a slow one can't stall the MQTT thread.
+        # A single worker keeps responses in arrival order.
+        self._callback_pool = self._create_callback_pool()
+
+        # Last time each (faculty_id, condition) warning was logged, so a unit
+        # stuck in a fault state doesn't log on every heartbeat
+        self._log_gate = {}
+        self._log_gate_interval = 60  # seconds
+
     def start(self):
         """
         Start the faculty response controller and subscribe to faculty response topics.
@@ -58,6 +87,17 @@ class FacultyResponseController:
         """
         logger.info("Stopping Faculty Response controller")
 
+        # Let queued callbacks finish, then leave a fresh pool for a later start()
+        self._callback_pool.shutdown(wait=True)
+        self._callback_pool = self._create_callback_pool()
+
+    @staticmethod
+    def _create_callback_pool():
+        """
+        Create the executor that runs registered callbacks.
+        """
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="fresp-cb")
+
     def register_callback(self, callback):
         """
         Register a callback to be called when a faculty response is received.
@@ -72,14 +112,24 @@ class FacultyResponseController:
         """
         Notify all registered callbacks with the response data.
 
+        Callbacks are submitted to the callback pool and return immediately.
+        The pool has one worker, so callbacks see responses in arrival order.
+
         Args:
             response_data (dict): Faculty response data
         """
         for callback in self.callbacks:
-            try:
-                callback(response_data)
-            except Exception as e:
-                logger.error(f"Error in Faculty Response controller callback: {str(e)}")
+            self._callback_pool.submit(self._run_callback, callback, response_data)
+
+    @staticmethod
+    def _run_callback(callback, response_data):
+        """
+        Run a single callback on the callback pool, logging any error.
+        """
+        try:
+            callback(response_data)
+        except Exception as e:
+            logger.error(f"Error in Faculty Response controller callback: {str(e)}")
 
     def handle_faculty_response(self, topic: str, data: Any):
         """
@@ -90,46 +140,50 @@ class FacultyResponseController:
             data (dict or str): Response data
         """
         # DEBUG: Log every message received to diagnose MQTT connectivity
-        logger.info(f"🔥 FACULTY RESPONSE HANDLER TRIGGERED - Topic: {topic}, Data Type: {type(data)}")
-        logger.info(f"🔥 Raw Data: {data}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("🔥 FACULTY RESPONSE HANDLER TRIGGERED - Topic: %s, Data Type: %s", topic, type(data))
+            logger.debug("🔥 Raw Data: %s", data)
         
         try:
+            # Extract faculty ID from topic, before spending time on the payload
+            match = _FACULTY_TOPIC_RE.match(topic)
+            if not match:
+                logger.error("Could not extract faculty ID from topic: %s", topic)
+                return
+            faculty_id = int(match[1])
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("🔥 Extracted faculty ID: %s", faculty_id)
+
             # Parse response data
             if isinstance(data, str):
                 try:
-                    response_data = json.loads(data)
-                    logger.info(f"🔥 Parsed JSON data: {response_data}")
+                    response_data = decode_mqtt_payload(data)
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("🔥 Parsed JSON data: %s", response_data)
                 except json.JSONDecodeError:
-                    logger.error(f"Invalid JSON in faculty response: {data}")
+                    logger.error("Invalid JSON in faculty response: %s", data)
                     return
             elif isinstance(data, dict):
                 response_data = data
-                logger.info(f"🔥 Dict data received: {response_data}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("🔥 Dict data received: %s", response_data)
             else:
-                logger.error(f"Invalid data type for faculty response: {type(data)}")
-                return
-
-            # Extract faculty ID from topic
-            faculty_id = None
-            try:
-                faculty_id = int(topic.split("/")[2])
-                logger.info(f"🔥 Extracted faculty ID: {faculty_id}")
-            except (IndexError, ValueError):
-                logger.error(f"Could not extract faculty ID from topic: {topic}")
+                logger.error("Invalid data type for faculty response: %s", type(data))
                 return
 
             # Validate required fields
             required_fields = ['faculty_id', 'response_type', 'message_id']
             for field in required_fields:
                 if field not in response_data:
-                    logger.error(f"Missing required field '{field}' in faculty response")
+                    logger.error("Missing required field '%s' in faculty response", field)
                     return
 
             response_type = response_data.get('response_type')
             message_id = response_data.get('message_id')
             faculty_name = response_data.get('faculty_name', 'Unknown')
 
-            logger.info(f"Received {response_type} response from faculty {faculty_id} ({faculty_name}) for message {message_id}")
+            logger.info("Received %s response from faculty %s (%s) for message %s",
+                        response_type, faculty_id, faculty_name, message_id)
 
             # Process the response
             success = self._process_faculty_response(response_data)
@@ -150,7 +204,7 @@ class FacultyResponseController:
                 publish_mqtt_message(MQTTTopics.SYSTEM_NOTIFICATIONS, notification)
 
         except Exception as e:
-            logger.error(f"Error handling faculty response: {str(e)}")
+            logger.error("Error handling faculty response: %s", e)
             import traceback
             logger.error(traceback.format_exc())
 
@@ -163,41 +217,63 @@ class FacultyResponseController:
             data (dict or str): Heartbeat data
         """
         try:
+            # Extract faculty ID from topic, before spending time on the payload
+            match = _FACULTY_TOPIC_RE.match(topic)
+            if not match:
+                return
+            faculty_id = int(match[1])
+
             # Parse heartbeat data
             if isinstance(data, str):
                 try:
-                    heartbeat_data = json.loads(data)
+                    heartbeat_data = decode_mqtt_payload(data)
                 except json.JSONDecodeError:
-                    logger.debug(f"Non-JSON heartbeat data: {data}")
+                    logger.debug("Non-JSON heartbeat data: %s", data)
                     return
             elif isinstance(data, dict):
                 heartbeat_data = data
             else:
                 return
 
-            # Extract faculty ID from topic
-            faculty_id = None
-            try:
-                faculty_id = int(topic.split("/")[2])
-            except (IndexError, ValueError):
-                return
-
             # Log NTP sync status if present
             if 'ntp_sync_status' in heartbeat_data:
                 ntp_status = heartbeat_data['ntp_sync_status']
                 if ntp_status in ['FAILED', 'SYNCING']:
-                    logger.warning(f"Faculty {faculty_id} NTP sync status: {ntp_status}")
+                    if self._should_log(faculty_id, f"ntp_{ntp_status}"):
+                        logger.warning("Faculty %s NTP sync status: %s", faculty_id, ntp_status)
                 elif ntp_status == 'SYNCED':
-                    logger.debug(f"Faculty {faculty_id} NTP sync: {ntp_status}")
+                    logger.debug("Faculty %s NTP sync: %s", faculty_id, ntp_status)
 
             # Log system health issues
             if 'free_heap' in heartbeat_data:
                 free_heap = heartbeat_data.get('free_heap', 0)
-                if free_heap < 50000:  # Less than 50KB free
-                    logger.warning(f"Faculty {faculty_id} low memory: {free_heap} bytes")
+                if free_heap < 50000 and self._should_log(faculty_id, "low_memory"):  # Less than 50KB free
+                    logger.warning("Faculty %s low memory: %s bytes", faculty_id, free_heap)
 
         except Exception as e:
-            logger.debug(f"Error processing faculty heartbeat: {str(e)}")
+            logger.debug("Error processing faculty heartbeat: %s", e)
+
+    def _should_log(self, faculty_id: int, condition: str) -> bool:
+        """
+        Check whether a heartbeat warning may be logged now.
+
+        Each (faculty_id, condition) pair is logged at most once per
+        _log_gate_interval seconds.
+
+        Args:
+            faculty_id (int): Faculty the warning is about
+            condition (str): Warning kind, e.g. "low_memory"
+
+        Returns:
+            bool: True if the warning should be logged
+        """
+        key = (faculty_id, condition)
+        now = time.monotonic()
+        last = self._log_gate.get(key)
+        if last is not None and now - last < self._log_gate_interval:
+            return False
+        self._log_gate[key] = now
+        return True
 
     def _process_faculty_response(self, response_data: Dict[str, Any]) -> bool:
         """
@@ -229,75 +305,84 @@ class FacultyResponseController:
             # ESP32 sends consultation_id as string, but database expects integer
             try:
                 consultation_id_int = int(consultation_id_from_response)
-                logger.debug(f"Converted consultation_id from '{consultation_id_from_response}' (string) to {consultation_id_int} (int)")
+                logger.debug("Converted consultation_id from '%s' (string) to %s (int)",
+                             consultation_id_from_response, consultation_id_int)
             except (ValueError, TypeError) as e:
-                logger.error(f"Invalid consultation_id format: '{consultation_id_from_response}' cannot be converted to integer: {e}")
+                logger.error("Invalid consultation_id format: '%s' cannot be converted to integer: %s",
+                             consultation_id_from_response, e)
                 return False
 
             # CRITICAL FIX: Convert faculty_id from string to integer for comparison
             try:
                 faculty_id_int = int(faculty_id_from_payload)
-                logger.debug(f"Converted faculty_id from '{faculty_id_from_payload}' (string) to {faculty_id_int} (int)")
+                logger.debug("Converted faculty_id from '%s' (string) to %s (int)",
+                             faculty_id_from_payload, faculty_id_int)
             except (ValueError, TypeError) as e:
-                logger.error(f"Invalid faculty_id format: '{faculty_id_from_payload}' cannot be converted to integer: {e}")
+                logger.error("Invalid faculty_id format: '%s' cannot be converted to integer: %s",
+                             faculty_id_from_payload, e)
                 return False
 
             db = get_db()
             try:
-                # Use the converted integer consultation_id for database query
-                consultation = db.query(Consultation).filter(Consultation.id == consultation_id_int).first()
+                # Only the columns checked below are needed; the update itself
+                # goes through ConsultationController
+                consultation = db.execute(
+                    select(
+                        Consultation.id,
+                        Consultation.faculty_id,
+                        Consultation.status,
+                        Consultation.student_id,
+                    ).where(Consultation.id == consultation_id_int)
+                ).first()
 
                 if not consultation:
-                    logger.warning(f"Consultation ID {consultation_id_int} (converted from '{consultation_id_from_response}') not found in database.")
+                    logger.warning("Consultation ID %s (converted from '%s') not found in database.",
+                                   consultation_id_int, consultation_id_from_response)
                     return False
 
                 # Verification - compare as integers
                 if consultation.faculty_id != faculty_id_int:
-                    logger.warning(f"Faculty ID mismatch for consultation {consultation.id}. "
-                                   f"Response payload for faculty {faculty_id_int} (converted from '{faculty_id_from_payload}'), "
-                                   f"but consultation belongs to faculty {consultation.faculty_id}. Ignoring response.")
+                    logger.warning("Faculty ID mismatch for consultation %s. "
+                                   "Response payload for faculty %s (converted from '%s'), "
+                                   "but consultation belongs to faculty %s. Ignoring response.",
+                                   consultation.id, faculty_id_int, faculty_id_from_payload, consultation.faculty_id)
                     return False
 
                 if consultation.status != ConsultationStatus.PENDING:
-                    logger.warning(f"Consultation {consultation.id} is no longer PENDING (current status: {consultation.status.value}). "
-                                   f"Response '{response_type}' may be late or redundant. Ignoring response.")
+                    logger.warning("Consultation %s is no longer PENDING (current status: %s). "
+                                   "Response '%s' may be late or redundant. Ignoring response.",
+                                   consultation.id, consultation.status.value, response_type)
                     return False
 
-                logger.info(f"Processing response '{response_type}' for PENDING consultation {consultation.id} (Faculty: {consultation.faculty_id})")
+                logger.info("Processing response '%s' for PENDING consultation %s (Faculty: %s)",
+                            response_type, consultation.id, consultation.faculty_id)
 
-                new_status_enum: Optional[ConsultationStatus] = None
-                if response_type == "ACKNOWLEDGE" or response_type == "ACCEPTED":
-                    new_status_enum = ConsultationStatus.ACCEPTED
-                elif response_type == "BUSY" or response_type == "UNAVAILABLE":
-                    new_status_enum = ConsultationStatus.BUSY
-                elif response_type == "REJECTED" or response_type == "DECLINED": # Allow "DECLINED"
-                    new_status_enum = ConsultationStatus.CANCELLED
-                elif response_type == "COMPLETED":
-                    new_status_enum = ConsultationStatus.COMPLETED
+                new_status_enum: Optional[ConsultationStatus] = _RESPONSE_STATUS_MAP.get(response_type)
 
                 if new_status_enum:
-                    # Import ConsultationController locally or ensure it's available via __init__
-                    from .consultation_controller import ConsultationController as SystemConsultationController
-                    cc = SystemConsultationController()
+                    cc = get_consultation_controller()
                     updated_consultation = cc.update_consultation_status(consultation.id, new_status_enum)
                     
                     if updated_consultation:
-                        logger.info(f"✅ Successfully updated consultation {consultation.id} to status {new_status_enum.value} via ConsultationController.")
+                        logger.info("✅ Successfully updated consultation %s to status %s via ConsultationController.",
+                                    consultation.id, new_status_enum.value)
                         # Add consultation_id and student_id to response_data for callbacks, if not already there
                         response_data['consultation_id'] = consultation.id 
                         response_data['student_id'] = consultation.student_id
                         return True
                     else:
-                        logger.error(f"Failed to update consultation {consultation.id} to {new_status_enum.value} using ConsultationController.")
+                        logger.error("Failed to update consultation %s to %s using ConsultationController.",
+                                     consultation.id, new_status_enum.value)
                         return False
                 else:
-                    logger.warning(f"Unknown or unhandled response_type: '{response_type}' for consultation {consultation.id}. Status not changed.")
+                    logger.warning("Unknown or unhandled response_type: '%s' for consultation %s. Status not changed.",
+                                   response_type, consultation.id)
                     return False
             finally:
                 db.close()
 
         except Exception as e:
-            logger.error(f"Critical error in _process_faculty_response: {str(e)}")
+            logger.error("Critical error in _process_faculty_response: %s", e)
             import traceback
             logger.error(traceback.format_exc())
             return False
@@ -312,26 +397,18 @@ class FacultyResponseController:
         try:
             db = get_db()
             try:
-                # Get response statistics from the database
-                total_acknowledged = db.query(Consultation).filter(
-                    Consultation.status == ConsultationStatus.ACCEPTED
-                ).count()
-
-                total_busy = db.query(Consultation).filter(
-                    Consultation.status == ConsultationStatus.BUSY
-                ).count()
-
-                total_declined = db.query(Consultation).filter(
-                    Consultation.status == ConsultationStatus.CANCELLED
-                ).count()
-
-                total_pending = db.query(Consultation).filter(
-                    Consultation.status == ConsultationStatus.PENDING
-                ).count()
-
-                total_completed = db.query(Consultation).filter(
-                    Consultation.status == ConsultationStatus.COMPLETED
-                ).count()
+                # Count every status in one grouped query
+                counts = dict(
+                    db.query(Consultation.status, func.count(Consultation.id))
+                    .group_by(Consultation.status)
+                    .all()
+                )
+
+                total_acknowledged = counts.get(ConsultationStatus.ACCEPTED, 0)
+                total_busy = counts.get(ConsultationStatus.BUSY, 0)
+                total_declined = counts.get(ConsultationStatus.CANCELLED, 0)
+                total_pending = counts.get(ConsultationStatus.PENDING, 0)
+                total_completed = counts.get(ConsultationStatus.COMPLETED, 0)
 
                 total_responded = total_acknowledged + total_busy + total_declined
                 total_all = total_responded + total_pending + total_completed
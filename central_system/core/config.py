@@ -4,14 +4,60 @@ Configuration settings for ConsultEase Central System.
 
 import os
 import logging
+from types import MappingProxyType
 from typing import Dict, Any
 
 logger = logging.getLogger(__name__)
 
+
+def _parse_bool(value: str) -> bool:
+    """Interpret an environment variable as a boolean flag."""
+    return value.lower() in ("true", "1", "yes")
+
+
+# Environment overrides: (variable, settings section, key, conversion)
+ENV_MAP = (
+    # Database settings
+    ("DB_TYPE", "DATABASE", "TYPE", str),
+    ("DB_PATH", "DATABASE", "PATH", str),
+    # MQTT settings
+    ("MQTT_BROKER", "MQTT", "BROKER", str),
+    ("MQTT_PORT", "MQTT", "PORT", int),
+    # System settings
+    ("DEBUG", "SYSTEM", "DEBUG", _parse_bool),
+    ("LOG_LEVEL", "SYSTEM", "LOG_LEVEL", str),
+    ("SECRET_KEY", "SYSTEM", "SECRET_KEY", str),
+    # UI settings
+    ("UI_THEME", "UI", "THEME", str),
+    ("UI_FULLSCREEN", "UI", "FULLSCREEN", _parse_bool),
+    ("UI_KEYBOARD", "UI", "KEYBOARD", str),
+)
+
+
 class Settings:
-    """Configuration settings for the application."""
-    
+    """
+    Configuration settings for the application.
+
+    Settings is a singleton: every Settings() call returns the same instance,
+    so defaults and environment overrides are loaded once per process. The
+    sections are read-only mappings once loaded.
+    """
+
+    # Singleton instance
+    _instance = None
+
+    def __new__(cls):
+        """Create the settings instance on first use and return it afterwards."""
+        if cls._instance is None:
+            instance = super().__new__(cls)
+            instance._init_once()
+            cls._instance = instance
+        return cls._instance
+
     def __init__(self):
+        """Settings are initialized once in _init_once()."""
+
+    def _init_once(self):
         """Initialize default settings."""
         # Database configuration
         self.DATABASE = {
@@ -22,6 +68,7 @@ class Settings:
             "POOL_TIMEOUT": 30,
             "POOL_RECYCLE": 1800
         }
+        self._load_database_config()
         
         # MQTT configuration
         self.MQTT = {
@@ -49,38 +96,33 @@ class Settings:
         
         # Load environment variables
         self._load_from_env()
-        
+
+        # Freeze the sections now that overrides are applied
+        for section in ("DATABASE", "MQTT", "SYSTEM", "UI"):
+            setattr(self, section, MappingProxyType(getattr(self, section)))
+
         logger.info("Configuration loaded")
     
+    def _load_database_config(self):
+        """
+        Take the database settings from the central configuration.
+
+        models.base connects with the same section, so both agree on the
+        database in use. Empty values keep the defaults above.
+        """
+        from ..config import get_config
+
+        for key, value in get_config().get('database', {}).items():
+            if value not in ('', None):
+                self.DATABASE[key.upper()] = value
+
     def _load_from_env(self):
-        """Load settings from environment variables."""
-        # Database settings
-        if os.environ.get("DB_TYPE"):
-            self.DATABASE["TYPE"] = os.environ.get("DB_TYPE")
-        if os.environ.get("DB_PATH"):
-            self.DATABASE["PATH"] = os.environ.get("DB_PATH")
-            
-        # MQTT settings
-        if os.environ.get("MQTT_BROKER"):
-            self.MQTT["BROKER"] = os.environ.get("MQTT_BROKER")
-        if os.environ.get("MQTT_PORT"):
-            self.MQTT["PORT"] = int(os.environ.get("MQTT_PORT"))
-            
-        # System settings
-        if os.environ.get("DEBUG"):
-            self.SYSTEM["DEBUG"] = os.environ.get("DEBUG").lower() in ("true", "1", "yes")
-        if os.environ.get("LOG_LEVEL"):
-            self.SYSTEM["LOG_LEVEL"] = os.environ.get("LOG_LEVEL")
-        if os.environ.get("SECRET_KEY"):
-            self.SYSTEM["SECRET_KEY"] = os.environ.get("SECRET_KEY")
-            
-        # UI settings
-        if os.environ.get("UI_THEME"):
-            self.UI["THEME"] = os.environ.get("UI_THEME")
-        if os.environ.get("UI_FULLSCREEN"):
-            self.UI["FULLSCREEN"] = os.environ.get("UI_FULLSCREEN").lower() in ("true", "1", "yes")
-        if os.environ.get("UI_KEYBOARD"):
-            self.UI["KEYBOARD"] = os.environ.get("UI_KEYBOARD")
+        """Load settings from environment variables listed in ENV_MAP."""
+        env = os.environ
+        for variable, section, key, convert in ENV_MAP:
+            value = env.get(variable)
+            if value:  # Unset and empty variables keep the default
+                getattr(self, section)[key] = convert(value)
 
 
 # Create global settings instance
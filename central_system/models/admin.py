@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Index
 from sqlalchemy.sql import func
 import bcrypt
 import os
@@ -24,6 +24,10 @@ class Admin(Base):
     Represents an administrator in the system.
     """
     __tablename__ = "admins"
+    # username gets a unique index from its column definition
+    __table_args__ = (
+        Index('idx_admin_is_active', 'is_active'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String, unique=True, index=True, nullable=False)
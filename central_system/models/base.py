@@ -1,4 +1,5 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text, Table, Column, String, select, delete, insert
+from sqlalchemy.exc import DBAPIError, DisconnectionError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, scoped_session
 from sqlalchemy.pool import QueuePool
@@ -6,8 +7,11 @@ import os
 import urllib.parse
 import getpass
 import logging
+import threading
 import time
 import functools
+import hashlib
+from contextlib import contextmanager
 
 # Set up logging (configuration handled centrally in main.py)
 logger = logging.getLogger(__name__)
@@ -29,83 +33,176 @@ from ..config import get_config
 # Get configuration
 config = get_config()
 
-# Database connection settings
-DB_TYPE = config.get('database.type', 'sqlite')  # Default to SQLite for development
+# Database connection settings, read from the one database section
+db_config = config.get('database', {})
+DB_TYPE = db_config.get('type', 'sqlite')  # Default to SQLite for development
+
+@functools.lru_cache(maxsize=None)
+def _build_postgres_url(user, password, host, port, name):
+    """
+    Build the PostgreSQL connection URL.
+
+    Cached per set of connection settings, so the URL is encoded once no
+    matter how many callers need it.
+
+    Args:
+        user (str): Database user
+        password (str): Database password, empty for peer authentication
+        host (str): Database host
+        port (int): Database port
+        name (str): Database name
+
+    Returns:
+        str: SQLAlchemy database URL
+    """
+    if host == 'localhost' and not password:
+        # Use Unix socket connection for peer authentication
+        logger.info("Connecting to PostgreSQL database: %s as %s using peer authentication", name, user)
+        return f"postgresql+psycopg2://{user}@/{name}"
+
+    # Use TCP connection with password
+    encoded_password = urllib.parse.quote_plus(password)
+    logger.info("Connecting to PostgreSQL database: %s:%s/%s as %s", host, port, name, user)
+    return f"postgresql://{user}:{encoded_password}@{host}:{port}/{name}"
 
 if DB_TYPE.lower() == 'sqlite':
     # Use SQLite for development/testing
-    DB_PATH = config.get('database.path', 'consultease.db')
+    DB_PATH = db_config.get('path', 'consultease.db')
     DATABASE_URL = f"sqlite:///{DB_PATH}"
-    logger.info(f"Connecting to SQLite database: {DB_PATH}")
+    logger.info("Connecting to SQLite database: %s", DB_PATH)
 else:
-    # Get current username - this will match PostgreSQL's peer authentication on Linux
-    current_user = getpass.getuser()
-
     # PostgreSQL connection settings
-    DB_USER = config.get('database.user', current_user)
-    DB_PASSWORD = config.get('database.password', '')  # Empty password for peer authentication
-    DB_HOST = config.get('database.host', 'localhost')
-    DB_PORT = config.get('database.port', 5432)  # Default PostgreSQL port
-    DB_NAME = config.get('database.name', 'consultease')
-
-    # Create PostgreSQL connection URL
-    if DB_HOST == 'localhost' and not DB_PASSWORD:
-        # Use Unix socket connection for peer authentication
-        DATABASE_URL = f"postgresql+psycopg2://{DB_USER}@/{DB_NAME}"
-        logger.info(f"Connecting to PostgreSQL database: {DB_NAME} as {DB_USER} using peer authentication")
-    else:
-        # Use TCP connection with password
-        encoded_password = urllib.parse.quote_plus(DB_PASSWORD)
-        DATABASE_URL = f"postgresql://{DB_USER}:{encoded_password}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-        logger.info(f"Connecting to PostgreSQL database: {DB_HOST}:{DB_PORT}/{DB_NAME} as {DB_USER}")
+    DB_USER = db_config.get('user')
+    if DB_USER is None:
+        # Current username - this will match PostgreSQL's peer authentication on Linux
+        DB_USER = getpass.getuser()
+    DB_PASSWORD = db_config.get('password', '')  # Empty password for peer authentication
+    DB_HOST = db_config.get('host', 'localhost')
+    DB_PORT = db_config.get('port', 5432)  # Default PostgreSQL port
+    DB_NAME = db_config.get('name', 'consultease')
+
+    DATABASE_URL = _build_postgres_url(DB_USER, DB_PASSWORD, DB_HOST, DB_PORT, DB_NAME)
 
 # Configure connection pooling options with sensible defaults
-pool_size = config.get('database.pool_size', 5)
-max_overflow = config.get('database.max_overflow', 10)
-pool_timeout = config.get('database.pool_timeout', 30)
-pool_recycle = config.get('database.pool_recycle', 1800)  # Recycle connections after 30 minutes
+pool_size = db_config.get('pool_size', 5)
+max_overflow = db_config.get('max_overflow', 10)
+pool_timeout = db_config.get('pool_timeout', 30)
+pool_recycle = db_config.get('pool_recycle', 1800)  # Recycle connections after 30 minutes
+
+# Applied to every new SQLite connection. WAL lets readers run alongside the
+# writer and, with synchronous=NORMAL, syncs at checkpoints instead of on every
+# commit, which matters on a Raspberry Pi SD card.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=134217728",  # 128 MB
+    "PRAGMA cache_size=-20000",  # ~20 MB
+)
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune a new SQLite connection, see SQLITE_PRAGMAS."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
 
-# Create engine with connection pooling
-if DB_TYPE.lower() == 'sqlite':
-    # SQLite configuration - use StaticPool for thread safety
-    from sqlalchemy.pool import StaticPool
-    engine = create_engine(
-        DATABASE_URL,
-        poolclass=StaticPool,  # Use StaticPool for SQLite
-        connect_args={
-            "check_same_thread": False,  # Allow SQLite to be used across threads
-            "timeout": 20  # Connection timeout
-        },
-        pool_pre_ping=True  # Check connection validity before using it
-    )
-    logger.info("Created SQLite engine with StaticPool and thread safety enabled")
-else:
-    # PostgreSQL with full connection pooling
-    engine = create_engine(
-        DATABASE_URL,
-        poolclass=QueuePool,
-        pool_size=pool_size,
-        max_overflow=max_overflow,
-        pool_timeout=pool_timeout,
-        pool_recycle=pool_recycle,
-        pool_pre_ping=True  # Check connection validity before using it
-    )
-    logger.info(f"Created PostgreSQL engine with connection pooling (size={pool_size}, max_overflow={max_overflow})")
+# Engine, created on first use by get_engine()
+_engine = None
+_engine_lock = threading.Lock()
 
-# Create session factory with thread safety
-session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _create_engine():
+    """
+    Create the engine with connection pooling for the configured database.
+    """
+    if DB_TYPE.lower() == 'sqlite':
+        # SQLite configuration - use StaticPool for thread safety
+        from sqlalchemy.pool import StaticPool
+        engine = create_engine(
+            DATABASE_URL,
+            poolclass=StaticPool,  # Use StaticPool for SQLite
+            connect_args={
+                "check_same_thread": False,  # Allow SQLite to be used across threads
+                "timeout": 20  # Connection timeout
+            },
+            # No pool_pre_ping: the single local file connection can't go
+            # stale the way a network connection can, so the per-checkout
+            # SELECT 1 would buy nothing
+        )
+        # StaticPool holds a single connection, so this runs once per process
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
+        logger.info("Created SQLite engine with StaticPool and thread safety enabled")
+    else:
+        # PostgreSQL with full connection pooling
+        engine = create_engine(
+            DATABASE_URL,
+            poolclass=QueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=True  # Check connection validity before using it
+        )
+        logger.info("Created PostgreSQL engine with connection pooling (size=%s, max_overflow=%s)", pool_size, max_overflow)
+    return engine
+
+def get_engine():
+    """
+    Get the database engine, creating it on first use.
+
+    Importing this module doesn't build the engine or its pool, so code paths
+    that never touch the database don't pay for it. The module attribute
+    ``engine`` resolves through this function as well.
+
+    Returns:
+        Engine: The shared SQLAlchemy engine
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = _create_engine()
+                if session_factory.kw.get('bind') is None:
+                    session_factory.configure(bind=engine)
+                _engine = engine
+    return _engine
+
+def __getattr__(name):
+    """Resolve the lazily created ``engine`` module attribute."""
+    if name == 'engine':
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Create session factory with thread safety. It is bound to the engine when
+# get_engine() first runs.
+session_factory = sessionmaker(autocommit=False, autoflush=False)
 SessionLocal = scoped_session(session_factory)
 
 # Create base class for models
 Base = declarative_base()
 
+# Connectivity probe, built once and reused
+SELECT_ONE = text("SELECT 1")
+
+# Key/value markers recorded by init_db, e.g. which schema upgrades have run
+schema_meta = Table(
+    'schema_meta', Base.metadata,
+    Column('key', String, primary_key=True),
+    Column('value', String),
+)
+
 def get_db(force_new=False, max_retries=3):
     """
     Get database session from the connection pool with enhanced error handling.
 
+    A dropped connection is retried once, immediately, after disposing of
+    the pool; other failures are not retried.
+
     Args:
         force_new (bool): If True, create a new session even if one exists
-        max_retries (int): Maximum number of retry attempts for connection failures
+        max_retries (int): Maximum number of attempts, capped at 2
 
     Returns:
         SQLAlchemy session: A database session from the connection pool
@@ -114,62 +211,48 @@ def get_db(force_new=False, max_retries=3):
         DatabaseConnectionError: When unable to establish database connection
     """
     last_error = None
+    attempts = max(1, min(max_retries, 2))
 
-    for attempt in range(max_retries):
+    for attempt in range(attempts):
+        db = None
         try:
-            # Get a session from the pool
+            # Get a session from the pool. On PostgreSQL, stale connections
+            # are detected and replaced on checkout by pool_pre_ping, so no
+            # separate health check query is needed here.
+            get_engine()
             db = SessionLocal()
 
-            # Enhanced connection test with health check
-            try:
-                result = db.execute("SELECT 1 as health_check")
-                health_check = result.fetchone()
-                if not health_check or health_check[0] != 1:
-                    raise DatabaseConnectionError("Health check failed")
-                logger.debug(f"Database connection test successful (attempt {attempt + 1})")
-            except Exception as test_error:
-                db.close()
-                logger.warning(f"Database connection test failed: {test_error}")
-
-                # Implement exponential backoff for retries
-                if attempt < max_retries - 1:
-                    wait_time = min(2 ** attempt, 30)  # Max 30 seconds
-                    logger.info(f"Waiting {wait_time} seconds before retry...")
-                    import time
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    raise DatabaseConnectionError(f"Database connection test failed after {max_retries} attempts: {test_error}")
-
             # If force_new is True, ensure we're getting fresh data
             if force_new:
                 # Expire all objects in the session to force a refresh from the database
                 db.expire_all()
 
             # Log connection acquisition for debugging
-            logger.debug(f"Acquired database connection from pool (attempt {attempt + 1})")
+            logger.debug("Acquired database connection from pool (attempt %s)", attempt + 1)
 
             return db
 
         except Exception as e:
             last_error = e
-            logger.warning(f"Database connection attempt {attempt + 1}/{max_retries} failed: {str(e)}")
+            logger.warning("Database connection attempt %s/%s failed: %s", attempt + 1, attempts, e)
 
             # If we got a session but there was an error, make sure to close it
-            if 'db' in locals():
+            if db is not None:
                 try:
                     db.close()
-                except:
+                except Exception:
                     pass  # Ignore errors during cleanup
 
-            # Wait before retrying (exponential backoff)
-            if attempt < max_retries - 1:
-                wait_time = min(2 ** attempt, 10)  # Max 10 seconds
-                logger.info(f"Waiting {wait_time} seconds before retry...")
-                time.sleep(wait_time)
+            # Only a dropped connection is worth retrying. Disposing of the
+            # pool makes the next attempt open a fresh connection right away.
+            disconnected = isinstance(e, DisconnectionError) or (
+                isinstance(e, DBAPIError) and e.connection_invalidated)
+            if not disconnected:
+                break
+            get_engine().dispose()
 
     # All retries failed
-    error_msg = f"Failed to establish database connection after {max_retries} attempts. Last error: {last_error}"
+    error_msg = f"Failed to establish database connection after {attempt + 1} attempt(s). Last error: {last_error}"
     logger.error(error_msg)
     raise DatabaseConnectionError(error_msg)
 
@@ -182,7 +265,37 @@ def close_db():
         SessionLocal.remove()
         logger.debug("Released database connection back to pool")
     except Exception as e:
-        logger.error(f"Error releasing database connection: {str(e)}")
+        logger.error("Error releasing database connection: %s", e)
+
+@contextmanager
+def db_session():
+    """
+    Provide the current thread's session for one unit of work.
+
+    The session is removed from the registry on exit, returning its
+    connection to the pool.
+
+    Yields:
+        SQLAlchemy session: The thread's scoped session
+    """
+    get_engine()
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        SessionLocal.remove()
+
+def _pool_metrics():
+    """
+    Read the raw connection pool counters.
+
+    Returns:
+        tuple: (size, checked_in, checked_out, overflow, invalid)
+    """
+    pool = get_engine().pool
+    # QueuePool.invalid() was removed in SQLAlchemy 2.0
+    invalid = pool.invalid() if hasattr(pool, 'invalid') else 0
+    return pool.size(), pool.checkedin(), pool.checkedout(), pool.overflow(), invalid
 
 def get_connection_pool_status():
     """
@@ -192,19 +305,19 @@ def get_connection_pool_status():
         dict: Connection pool statistics
     """
     try:
-        pool = engine.pool
+        size, checked_in, checked_out, overflow, invalid = _pool_metrics()
         return {
-            'pool_size': pool.size(),
-            'checked_in': pool.checkedin(),
-            'checked_out': pool.checkedout(),
-            'overflow': pool.overflow(),
-            'invalid': pool.invalid(),
-            'total_connections': pool.size() + pool.overflow(),
-            'available_connections': pool.checkedin(),
-            'pool_status': 'healthy' if pool.checkedin() > 0 else 'warning'
+            'pool_size': size,
+            'checked_in': checked_in,
+            'checked_out': checked_out,
+            'overflow': overflow,
+            'invalid': invalid,
+            'total_connections': size + overflow,
+            'available_connections': checked_in,
+            'pool_status': 'healthy' if checked_in > 0 else 'warning'
         }
     except Exception as e:
-        logger.error(f"Error getting connection pool status: {e}")
+        logger.error("Error getting connection pool status: %s", e)
         return {
             'pool_status': 'error',
             'error': str(e)
@@ -215,30 +328,29 @@ def monitor_connection_pool():
     Monitor connection pool health and log warnings if issues detected.
     """
     try:
-        status = get_connection_pool_status()
-
-        # Log pool status for debugging
-        logger.debug(f"Connection pool status: {status}")
-
-        # Check for potential issues
-        if status.get('pool_status') == 'error':
-            logger.error(f"Connection pool error: {status.get('error')}")
+        try:
+            metrics = _pool_metrics()
+        except Exception as e:
+            logger.error("Connection pool error: %s", e)
             return False
 
-        # Warn if pool is nearly exhausted
-        total_connections = status.get('total_connections', 0)
-        available_connections = status.get('available_connections', 0)
+        size, checked_in, checked_out, overflow, invalid = metrics
+        logger.debug("Connection pool status: size=%s checked_in=%s checked_out=%s overflow=%s invalid=%s",
+                     size, checked_in, checked_out, overflow, invalid)
 
+        # Warn if pool is nearly exhausted
+        total_connections = size + overflow
         if total_connections > 0:
-            utilization = (total_connections - available_connections) / total_connections
+            utilization = (total_connections - checked_in) / total_connections
             if utilization > 0.8:  # 80% utilization
-                logger.warning(f"High connection pool utilization: {utilization:.1%}")
-                logger.warning(f"Pool stats: {status}")
+                logger.warning("High connection pool utilization: %.1f%%", utilization * 100)
+                logger.warning("Pool stats: size=%s checked_in=%s checked_out=%s overflow=%s invalid=%s",
+                               size, checked_in, checked_out, overflow, invalid)
 
         return True
 
     except Exception as e:
-        logger.error(f"Error monitoring connection pool: {e}")
+        logger.error("Error monitoring connection pool: %s", e)
         return False
 
 def recover_connection_pool():
@@ -249,19 +361,19 @@ def recover_connection_pool():
         logger.info("Attempting connection pool recovery...")
 
         # Force close all connections and recreate pool
-        engine.dispose()
+        get_engine().dispose()
         logger.info("Disposed old connection pool")
 
         # Test new connection
         test_db = get_db()
-        test_db.execute("SELECT 1")
+        test_db.execute(SELECT_ONE)
         test_db.close()
 
         logger.info("✅ Connection pool recovery successful")
         return True
 
     except Exception as e:
-        logger.error(f"❌ Connection pool recovery failed: {e}")
+        logger.error("❌ Connection pool recovery failed: %s", e)
         return False
 
 def db_operation_with_retry(max_retries=3, retry_delay=0.5):
@@ -282,27 +394,28 @@ def db_operation_with_retry(max_retries=3, retry_delay=0.5):
             last_error = None
 
             while retries < max_retries:
-                db = get_db()
                 try:
-                    # Call the original function with the db session and all arguments
-                    result = func(db, *args, **kwargs)
-                    db.commit()
-                    return result
+                    with db_session() as db:
+                        try:
+                            # Call the original function with the db session and all arguments
+                            result = func(db, *args, **kwargs)
+                            db.commit()
+                            return result
+                        except Exception:
+                            db.rollback()
+                            raise
                 except Exception as e:
-                    db.rollback()
                     last_error = e
                     retries += 1
 
                     # Log the error
                     if retries < max_retries:
-                        logger.warning(f"Database operation failed (attempt {retries}/{max_retries}): {e}")
-                        # Exponential backoff
+                        logger.warning("Database operation failed (attempt %s/%s): %s", retries, max_retries, e)
+                        # Exponential backoff, with the session already released
                         sleep_time = retry_delay * (2 ** (retries - 1))
                         time.sleep(sleep_time)
                     else:
-                        logger.error(f"Database operation failed after {max_retries} attempts: {e}")
-                finally:
-                    db.close()
+                        logger.error("Database operation failed after %s attempts: %s", max_retries, e)
 
             # If we've exhausted all retries, raise the last error
             raise last_error
@@ -311,63 +424,63 @@ def db_operation_with_retry(max_retries=3, retry_delay=0.5):
 
     return decorator
 
-def _create_performance_indexes():
+# Migrations run by init_db alongside the index check. Bump a version here
+# when a migration changes so existing databases run the upgrade steps again.
+SCHEMA_MIGRATIONS = ('busy_at_v1', 'faculty_version_v1')
+SCHEMA_HASH_KEY = 'indexes_hash'
+
+@functools.lru_cache(maxsize=1)
+def _schema_hash():
     """
-    Create database indexes for frequently queried fields to improve performance.
-    This is especially important for Raspberry Pi deployment where query speed matters.
+    Fingerprint the indexes declared on the models and the migration list.
+
+    The model metadata is fixed once the models are imported, so the digest
+    is computed once per process.
+
+    Returns:
+        str: SHA-1 hex digest
     """
-    try:
-        # Get database connection
-        db = get_db()
+    parts = sorted(
+        f"{table.name}.{index.name}({','.join(column.name for column in index.columns)})"
+        for table in Base.metadata.tables.values()
+        for index in table.indexes
+    )
+    parts.extend(SCHEMA_MIGRATIONS)
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()
 
-        # Define indexes for performance optimization
-        indexes = [
-            # Student table indexes
-            "CREATE INDEX IF NOT EXISTS idx_student_rfid_uid ON students(rfid_uid);",
-            "CREATE INDEX IF NOT EXISTS idx_student_name ON students(name);",
-            "CREATE INDEX IF NOT EXISTS idx_student_department ON students(department);",
-
-            # Faculty table indexes
-            "CREATE INDEX IF NOT EXISTS idx_faculty_ble_id ON faculty(ble_id);",
-            "CREATE INDEX IF NOT EXISTS idx_faculty_status ON faculty(status);",
-            "CREATE INDEX IF NOT EXISTS idx_faculty_department ON faculty(department);",
-            "CREATE INDEX IF NOT EXISTS idx_faculty_name ON faculty(name);",
-
-            # Consultation table indexes
-            "CREATE INDEX IF NOT EXISTS idx_consultation_student_id ON consultations(student_id);",
-            "CREATE INDEX IF NOT EXISTS idx_consultation_faculty_id ON consultations(faculty_id);",
-            "CREATE INDEX IF NOT EXISTS idx_consultation_status ON consultations(status);",
-            "CREATE INDEX IF NOT EXISTS idx_consultation_created_at ON consultations(created_at);",
-
-            # Admin table indexes
-            "CREATE INDEX IF NOT EXISTS idx_admin_username ON admins(username);",
-            "CREATE INDEX IF NOT EXISTS idx_admin_is_active ON admins(is_active);",
-
-            # Composite indexes for common query patterns
-            "CREATE INDEX IF NOT EXISTS idx_consultation_student_status ON consultations(student_id, status);",
-            "CREATE INDEX IF NOT EXISTS idx_consultation_faculty_status ON consultations(faculty_id, status);",
-            "CREATE INDEX IF NOT EXISTS idx_consultation_requested_at ON consultations(requested_at);",
-
-            # New indexes for enhanced consultation features
-            "CREATE INDEX IF NOT EXISTS idx_consultation_busy_at ON consultations(busy_at);",
-        ]
-
-        # Execute each index creation
-        for index_sql in indexes:
-            try:
-                db.execute(index_sql)
-                logger.debug(f"Created index: {index_sql}")
-            except Exception as e:
-                logger.warning(f"Index creation failed (may already exist): {index_sql} - {str(e)}")
+def _create_missing_indexes():
+    """
+    Create indexes declared on the models that are missing from existing tables.
 
-        db.commit()
-        logger.info("Performance indexes created successfully")
+    create_all() only emits a table's indexes together with the table, so
+    indexes added to a model later must be created here on older databases.
+    """
+    engine = get_engine()
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    logger.info("Model indexes verified")
 
-    except Exception as e:
-        logger.error(f"Error creating performance indexes: {str(e)}")
-    finally:
-        if 'db' in locals():
-            db.close()
+def _schema_upgrades_current():
+    """
+    Check whether this database already has the current indexes and migrations.
+
+    Returns:
+        bool: True if the recorded schema hash matches _schema_hash()
+    """
+    with get_engine().connect() as connection:
+        recorded = connection.execute(
+            select(schema_meta.c.value).where(schema_meta.c.key == SCHEMA_HASH_KEY)
+        ).scalar()
+    return recorded == _schema_hash()
+
+def _record_schema_upgrades():
+    """
+    Record _schema_hash() once the indexes and migrations have been applied.
+    """
+    with get_engine().begin() as connection:
+        connection.execute(delete(schema_meta).where(schema_meta.c.key == SCHEMA_HASH_KEY))
+        connection.execute(insert(schema_meta).values(key=SCHEMA_HASH_KEY, value=_schema_hash()))
 
 def migrate_database_for_busy_status():
     """
@@ -375,17 +488,16 @@ def migrate_database_for_busy_status():
     This function is safe to run multiple times.
     """
     try:
-        # Get database connection
-        db = get_db()
+        # Reflect the columns through the inspector, which works on both
+        # SQLite and PostgreSQL (PRAGMA table_info is SQLite-only)
+        engine = get_engine()
+        columns = {column['name'] for column in inspect(engine).get_columns('consultations')}
 
-        # Check if busy_at column already exists
-        result = db.execute("PRAGMA table_info(consultations);").fetchall()
-        columns = [row[1] for row in result]
-        
         if 'busy_at' not in columns:
             logger.info("Adding busy_at column to consultations table...")
-            db.execute("ALTER TABLE consultations ADD COLUMN busy_at DATETIME;")
-            db.commit()
+            column_type = 'TIMESTAMP' if engine.dialect.name == 'postgresql' else 'DATETIME'
+            with engine.begin() as connection:
+                connection.execute(text(f"ALTER TABLE consultations ADD COLUMN busy_at {column_type}"))
             logger.info("Successfully added busy_at column to consultations table")
         else:
             logger.info("busy_at column already exists in consultations table")
@@ -395,11 +507,29 @@ def migrate_database_for_busy_status():
         logger.info("Database migration for BUSY status completed successfully")
 
     except Exception as e:
-        logger.error(f"Error during database migration: {str(e)}")
+        logger.error("Error during database migration: %s", e)
+        raise
+
+def migrate_database_for_faculty_version():
+    """
+    Migrate existing database to add version column to faculty table.
+    This function is safe to run multiple times.
+    """
+    try:
+        engine = get_engine()
+        columns = [column['name'] for column in inspect(engine).get_columns('faculty')]
+
+        if 'version' not in columns:
+            logger.info("Adding version column to faculty table...")
+            with engine.begin() as connection:
+                connection.execute(text("ALTER TABLE faculty ADD COLUMN version INTEGER NOT NULL DEFAULT 1"))
+            logger.info("Successfully added version column to faculty table")
+        else:
+            logger.info("version column already exists in faculty table")
+
+    except Exception as e:
+        logger.error("Error during faculty version migration: %s", e)
         raise
-    finally:
-        if 'db' in locals():
-            db.close()
 
 def _ensure_admin_account_integrity():
     """
@@ -420,7 +550,7 @@ def _ensure_admin_account_integrity():
         admin_accounts = db.query(Admin).all()
         default_admin = db.query(Admin).filter(Admin.username == "admin").first()
 
-        logger.info(f"Admin account integrity check: Found {len(admin_accounts)} admin account(s)")
+        logger.info("Admin account integrity check: Found %s admin account(s)", len(admin_accounts))
 
         # Case 1: No admin accounts exist at all
         if len(admin_accounts) == 0:
@@ -438,7 +568,7 @@ def _ensure_admin_account_integrity():
             return _validate_and_fix_admin(db, default_admin)
 
     except Exception as e:
-        logger.error(f"Critical error during admin account integrity check: {e}")
+        logger.error("Critical error during admin account integrity check: %s", e)
         if db:
             db.rollback()
         return False
@@ -480,7 +610,7 @@ def _create_default_admin(db):
         return _test_admin_login(default_admin, "TempPass123!")
 
     except Exception as e:
-        logger.error(f"Failed to create default admin account: {e}")
+        logger.error("Failed to create default admin account: %s", e)
         db.rollback()
         return False
 
@@ -519,7 +649,7 @@ def _validate_and_fix_admin(db, admin):
         # Apply fixes if any were needed
         if fixes_applied:
             db.commit()
-            logger.warning(f"🔧 Fixed admin account issues: {', '.join(fixes_applied)}")
+            logger.warning("🔧 Fixed admin account issues: %s", ', '.join(fixes_applied))
             logger.info("🔑 Admin account is configured - use admin interface to set secure password")
         else:
             logger.info("✅ Default admin account is properly configured")
@@ -528,7 +658,7 @@ def _validate_and_fix_admin(db, admin):
         return True
 
     except Exception as e:
-        logger.error(f"Failed to validate/fix admin account: {e}")
+        logger.error("Failed to validate/fix admin account: %s", e)
         db.rollback()
         return False
 
@@ -553,7 +683,7 @@ def _test_admin_login(admin, password):
             return False
 
     except Exception as e:
-        logger.error(f"❌ Admin login test failed with error: {e}")
+        logger.error("❌ Admin login test failed with error: %s", e)
         return False
 
 def init_db(force_recreate=False, auto_create_admin=True):
@@ -566,6 +696,7 @@ def init_db(force_recreate=False, auto_create_admin=True):
     """
     try:
         logger.info("Initializing database...")
+        engine = get_engine()
         
         if force_recreate:
             logger.warning("Force recreating database - all data will be lost!")
@@ -575,11 +706,19 @@ def init_db(force_recreate=False, auto_create_admin=True):
         Base.metadata.create_all(bind=engine)
         logger.info("Database tables created successfully")
         
-        # Run database migration for BUSY status
-        migrate_database_for_busy_status()
-        
-        # Create performance indexes
-        _create_performance_indexes()
+        # Migrations and indexes only need to run again when they change
+        if _schema_upgrades_current():
+            logger.info("Schema migrations and indexes are up to date")
+        else:
+            # Run database migration for BUSY status
+            migrate_database_for_busy_status()
+
+            # Run database migration for faculty status versioning
+            migrate_database_for_faculty_version()
+
+            # Create indexes added to the models since these tables were created
+            _create_missing_indexes()
+            _record_schema_upgrades()
         
         # Ensure admin account integrity only if requested
         if auto_create_admin:
@@ -591,5 +730,5 @@ def init_db(force_recreate=False, auto_create_admin=True):
         logger.info("Database initialization completed successfully")
         
     except Exception as e:
-        logger.error(f"Database initialization failed: {str(e)}")
+        logger.error("Database initialization failed: %s", e)
         raise
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -20,6 +20,14 @@ class Consultation(Base):
     Represents a consultation request between a student and faculty.
     """
     __tablename__ = "consultations"
+    # The composite indexes also serve lookups by student_id or faculty_id alone
+    __table_args__ = (
+        Index('idx_consultation_status', 'status'),
+        Index('idx_consultation_student_status', 'student_id', 'status'),
+        Index('idx_consultation_faculty_status', 'faculty_id', 'status'),
+        Index('idx_consultation_requested_at', 'requested_at'),
+        Index('idx_consultation_busy_at', 'busy_at'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
@@ -1,9 +1,10 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Index
 from sqlalchemy.sql import func
 from .base import Base
 import os
 import re
 import logging
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +14,12 @@ class Faculty(Base):
     Represents a faculty member in the system.
     """
     __tablename__ = "faculty"
+    # email and ble_id get unique indexes from their column definitions
+    __table_args__ = (
+        Index('idx_faculty_status', 'status'),
+        Index('idx_faculty_department', 'department'),
+        Index('idx_faculty_name', 'name'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -28,6 +35,7 @@ class Faculty(Base):
     last_seen = Column(DateTime, default=func.now())
     ntp_sync_status = Column(String, default='PENDING')  # NTP sync status from desk unit
     grace_period_active = Column(Boolean, default=False)  # Whether grace period is active
+    version = Column(Integer, nullable=False, default=1)  # Bumped on every status change
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
@@ -139,9 +147,11 @@ class Faculty(Base):
         return bool(re.match(uuid_pattern, ble_id) or re.match(mac_pattern, ble_id))
 
     @staticmethod
+    @lru_cache(maxsize=1024)
     def normalize_mac_address(mac_address):
         """
         Normalize MAC address format to uppercase with colon separators.
+        Results are cached since the same addresses repeat on every heartbeat.
 
         Args:
             mac_address (str): MAC address to normalize
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from sqlalchemy.sql import func
 from .base import Base
 
@@ -8,6 +8,11 @@ class Student(Base):
     Represents a student in the system.
     """
     __tablename__ = "students"
+    # rfid_uid gets a unique index from its column definition
+    __table_args__ = (
+        Index('idx_student_name', 'name'),
+        Index('idx_student_department', 'department'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
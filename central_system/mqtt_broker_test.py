@@ -5,23 +5,92 @@ Tests MQTT connectivity, topic permissions, and message flow
 """
 
 import paho.mqtt.client as mqtt
+from paho.mqtt.packettypes import PacketTypes
+from paho.mqtt.properties import Properties
 import json
+import contextlib
+import logging
+import os
 import time
 import threading
 import sys
+import queue
+import socket
+import ssl
+from collections import deque, namedtuple
+from typing import Final
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+log = logging.getLogger("mqtt_tester")
+
+# MQTT Configuration, read once at import. Set the environment variables
+# (or update the defaults) to match your setup.
+MQTT_SERVER: Final = os.environ.get("MQTT_SERVER", "172.20.10.8")
+MQTT_PORT: Final = int(os.environ.get("MQTT_PORT", "1883"))
+MQTT_USERNAME: Final = os.environ.get("MQTT_USERNAME", "faculty_desk")
+MQTT_PASSWORD: Final = os.environ.get("MQTT_PASSWORD", "desk_password")
+FACULTY_ID: Final = int(os.environ.get("FACULTY_ID", "1"))
+# TLS is off by default; TLS brokers usually listen on port 8883
+MQTT_USE_TLS: Final = os.environ.get("MQTT_USE_TLS", "").lower() in ("true", "1", "yes")
+MQTT_CA_CERTS: Final = os.environ.get("MQTT_CA_CERTS") or None
+
+# One TLS context shared by every connection this process makes, so the
+# certificates are loaded once
+_SSL_CTX = ssl.create_default_context(cafile=MQTT_CA_CERTS) if MQTT_USE_TLS else None
+
+# A fixed client ID and session expiry let the broker keep the session
+# (and its subscriptions) between test runs
+MQTT_CLIENT_ID = "consultease-tester"
+SESSION_EXPIRY = 3600  # seconds
+
+# Topics exercised by the tests, built once from the configuration above
+PROBE_TOPICS = tuple(
+    f"consultease/faculty/{FACULTY_ID}/{suffix}"
+    for suffix in ("status", "messages", "responses", "heartbeat")
+) + (f"faculty/{FACULTY_ID}/status",)  # Legacy topic
+RESPONSE_TOPIC: Final = f"consultease/faculty/{FACULTY_ID}/responses"
+MESSAGE_TOPIC: Final = f"consultease/faculty/{FACULTY_ID}/messages"
+# Subscribed once per connection, in a single SUBSCRIBE packet
+SUBSCRIBED_TOPICS = [(RESPONSE_TOPIC, 1)]
+# Received topics worth recording; anything else (e.g. left over from an
+# older persistent session) is ignored
+RESPONSE_PREFIXES = (RESPONSE_TOPIC,)
+
+# Received messages kept for the summary; older ones are dropped beyond this
+MAX_RECEIVED_MESSAGES = 1024
+
+RxMsg = namedtuple("RxMsg", "topic payload ts")
+
+
+def encode_payload(payload):
+    """Encode a payload as JSON, as bytes with orjson or str with the json module."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload)
+
+
+def decode_payload(data):
+    """Decode a JSON payload from bytes; orjson parses them without an intermediate str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
-# MQTT Configuration (update these to match your setup)
-MQTT_SERVER = "172.20.10.8"
-MQTT_PORT = 1883
-MQTT_USERNAME = "faculty_desk"
-MQTT_PASSWORD = "desk_password"
-FACULTY_ID = 1
 
 class MQTTTester:
     def __init__(self):
-        self.received_messages = []
-        self.client = mqtt.Client()
+        self.received_messages = deque(maxlen=MAX_RECEIVED_MESSAGES)
+        # Filled on paho's network thread, printed from the main thread by _drain()
+        self._rx_q = queue.SimpleQueue()
+        self.client = mqtt.Client(client_id=MQTT_CLIENT_ID, protocol=mqtt.MQTTv5)
         self.client.username_pw_set(MQTT_USERNAME, MQTT_PASSWORD)
+        # Let QoS 1 publishes pipeline instead of stalling on the default window
+        self.client.max_inflight_messages_set(100)
+        if _SSL_CTX is not None:
+            self.client.tls_set_context(_SSL_CTX)
         
         # Set up callbacks
         self.client.on_connect = self.on_connect
@@ -30,63 +99,76 @@ class MQTTTester:
         self.client.on_publish = self.on_publish
         self.client.on_disconnect = self.on_disconnect
         
-        self.connected = False
+        # Set on CONNACK and on every received message, so waits wake up at once
+        self._connected_evt = threading.Event()
+        self._message_evt = threading.Event()
+
+        # Encoded probe payloads by topic, built by test_faculty_topics()
+        self._probe_payloads = {}
         
-    def on_connect(self, client, userdata, flags, rc):
+    def on_connect(self, client, userdata, flags, rc, properties=None):
         if rc == 0:
             print(f"✅ Connected to MQTT broker (RC: {rc})")
-            self.connected = True
+            # Every publish is small, so send it right away instead of
+            # letting Nagle's algorithm hold it back
+            sock = client.socket()
+            if sock is not None:
+                try:
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                except OSError as e:
+                    print(f"   ⚠️  Could not disable Nagle's algorithm: {e}")
+            # Subscribe to response topic to catch ESP32 messages
+            print(f"📡 Subscribing to {', '.join(topic for topic, _ in SUBSCRIBED_TOPICS)}...")
+            client.subscribe(SUBSCRIBED_TOPICS)
+            self._connected_evt.set()
         else:
+            # MQTT v5 reason codes describe themselves, e.g. "Bad user name or password"
             print(f"❌ Failed to connect to MQTT broker (RC: {rc})")
-            error_messages = {
-                1: "Connection refused - incorrect protocol version",
-                2: "Connection refused - invalid client identifier",
-                3: "Connection refused - server unavailable", 
-                4: "Connection refused - bad username or password",
-                5: "Connection refused - not authorised"
-            }
-            print(f"   Error: {error_messages.get(rc, 'Unknown error')}")
             
     def on_message(self, client, userdata, msg):
-        try:
-            payload = msg.payload.decode('utf-8')
+        # Keep the network loop tight: hand the message over and return
+        if not msg.topic.startswith(RESPONSE_PREFIXES):
+            return
+        self._rx_q.put((msg.topic, msg.payload, msg.qos, msg.retain, time.time()))
+        self._message_evt.set()
+
+    def _drain(self):
+        """Print and record the messages received since the last drain."""
+        while True:
+            try:
+                topic, payload, qos, retain, timestamp = self._rx_q.get_nowait()
+            except queue.Empty:
+                return
+            # Payloads are kept as the raw bytes and only decoded for display
+            self.received_messages.append(RxMsg(topic, payload, timestamp))
+
             print(f"📨 Received message:")
-            print(f"   Topic: {msg.topic}")
-            print(f"   Payload: {payload}")
-            print(f"   QoS: {msg.qos}")
-            print(f"   Retained: {msg.retain}")
-            
-            self.received_messages.append({
-                'topic': msg.topic,
-                'payload': payload,
-                'timestamp': time.time()
-            })
-        except Exception as e:
-            print(f"❌ Error processing message: {e}")
+            print(f"   Topic: {topic}")
+            print(f"   Payload: {payload.decode('utf-8', errors='replace')}")
+            print(f"   QoS: {qos}")
+            print(f"   Retained: {retain}")
             
-    def on_subscribe(self, client, userdata, mid, granted_qos):
+    def on_subscribe(self, client, userdata, mid, granted_qos, properties=None):
         print(f"✅ Subscription successful (QoS: {granted_qos})")
         
     def on_publish(self, client, userdata, mid):
-        print(f"✅ Message published (MID: {mid})")
+        log.debug("published mid=%d", mid)
         
-    def on_disconnect(self, client, userdata, rc):
+    def on_disconnect(self, client, userdata, rc, properties=None):
         print(f"🔌 Disconnected from MQTT broker (RC: {rc})")
-        self.connected = False
+        self._connected_evt.clear()
         
     def connect(self):
         print(f"🔌 Connecting to MQTT broker {MQTT_SERVER}:{MQTT_PORT}...")
         try:
-            self.client.connect(MQTT_SERVER, MQTT_PORT, 60)
+            properties = Properties(PacketTypes.CONNECT)
+            properties.SessionExpiryInterval = SESSION_EXPIRY
+            self.client.connect(MQTT_SERVER, MQTT_PORT, keepalive=60,
+                                clean_start=False, properties=properties)
             self.client.loop_start()
             
             # Wait for connection
-            timeout = 10
-            start_time = time.time()
-            while not self.connected and (time.time() - start_time) < timeout:
-                time.sleep(0.1)
-                
-            if not self.connected:
+            if not self._connected_evt.wait(timeout=10):
                 print("❌ Connection timeout")
                 return False
                 
@@ -99,55 +181,53 @@ class MQTTTester:
         """Test faculty-specific topics"""
         print(f"\n🧪 Testing Faculty {FACULTY_ID} Topics...")
         
-        # Topics to test
-        topics = [
-            f"consultease/faculty/{FACULTY_ID}/status",
-            f"consultease/faculty/{FACULTY_ID}/messages", 
-            f"consultease/faculty/{FACULTY_ID}/responses",
-            f"consultease/faculty/{FACULTY_ID}/heartbeat",
-            f"faculty/{FACULTY_ID}/status",  # Legacy topic
-        ]
-        
-        # Subscribe to response topic to catch ESP32 messages
-        response_topic = f"consultease/faculty/{FACULTY_ID}/responses"
-        print(f"📡 Subscribing to {response_topic}...")
-        self.client.subscribe(response_topic, qos=1)
-        time.sleep(1)
-        
-        # Test publishing to each topic
-        for topic in topics:
-            print(f"\n📤 Testing publish to: {topic}")
-            
-            test_payload = {
+        # Test publishing to each topic. The probes are fire-and-forget, so
+        # they go out back-to-back at QoS 0 without waiting for a PUBACK each.
+        # All payloads are encoded up front, so the loop below only publishes
+        timestamp = int(time.time())
+        self._probe_payloads = {
+            topic: encode_payload({
                 "test": "broker_connectivity",
-                "timestamp": int(time.time()),
+                "timestamp": timestamp,
                 "topic": topic,
                 "faculty_id": FACULTY_ID
-            }
+            })
+            for topic in PROBE_TOPICS
+        }
+
+        result = None
+        # Report lines are collected and written once after the batch is sent
+        lines = []
+        for topic, payload in self._probe_payloads.items():
+            lines.append(f"\n📤 Testing publish to: {topic}")
             
             try:
-                result = self.client.publish(topic, json.dumps(test_payload), qos=1)
+                result = self.client.publish(topic, payload, qos=0)
                 if result.rc == mqtt.MQTT_ERR_SUCCESS:
-                    print(f"   ✅ Publish SUCCESS (MID: {result.mid})")
+                    lines.append(f"   ✅ Publish SUCCESS (MID: {result.mid})")
                 else:
-                    print(f"   ❌ Publish FAILED (RC: {result.rc})")
+                    lines.append(f"   ❌ Publish FAILED (RC: {result.rc})")
+            except Exception as e:
+                lines.append(f"   ❌ Publish ERROR: {e}")
+        sys.stdout.write("\n".join(lines) + "\n")
+
+        # Make sure the whole batch has left the client before waiting
+        if result is not None and result.rc == mqtt.MQTT_ERR_SUCCESS:
+            try:
+                result.wait_for_publish(timeout=2)
             except Exception as e:
-                print(f"   ❌ Publish ERROR: {e}")
+                print(f"   ⚠️  Probe flush incomplete: {e}")
                 
         # Wait for any responses
         print(f"\n⏳ Waiting 5 seconds for ESP32 responses...")
         time.sleep(5)
+        self._drain()
         
     def test_consultation_flow(self):
         """Test a complete consultation message flow"""
         print(f"\n🔄 Testing Consultation Flow...")
         
-        # Subscribe to response topic
-        response_topic = f"consultease/faculty/{FACULTY_ID}/responses"
-        self.client.subscribe(response_topic, qos=1)
-        
         # Send a test consultation
-        message_topic = f"consultease/faculty/{FACULTY_ID}/messages"
         consultation_data = {
             "id": 999,
             "student_id": 1,
@@ -161,8 +241,9 @@ class MQTTTester:
             "requested_at": time.strftime("%Y-%m-%dT%H:%M:%S")
         }
         
-        print(f"📤 Sending test consultation to {message_topic}...")
-        result = self.client.publish(message_topic, json.dumps(consultation_data), qos=1)
+        print(f"📤 Sending test consultation to {MESSAGE_TOPIC}...")
+        self._message_evt.clear()
+        result = self.client.publish(MESSAGE_TOPIC, encode_payload(consultation_data), qos=1)
         
         if result.rc == mqtt.MQTT_ERR_SUCCESS:
             print(f"   ✅ Consultation sent successfully")
@@ -171,19 +252,54 @@ class MQTTTester:
             
             # Wait for faculty response
             print(f"⏳ Waiting 30 seconds for faculty button response...")
-            start_time = time.time()
-            initial_count = len(self.received_messages)
-            
-            while (time.time() - start_time) < 30:
-                if len(self.received_messages) > initial_count:
-                    print(f"🎉 Received faculty response!")
-                    break
-                time.sleep(1)
+            if self._message_evt.wait(timeout=30):
+                self._drain()
+                print(f"🎉 Received faculty response!")
+                self._report_response(self.received_messages[-1])
             else:
                 print(f"⚠️  No response received - check ESP32 and button press")
         else:
             print(f"   ❌ Failed to send consultation (RC: {result.rc})")
             
+    def _report_response(self, message):
+        """Print the response type and message ID of a faculty response."""
+        try:
+            data = decode_payload(message.payload)
+        except ValueError:
+            print(f"   ⚠️  Response is not valid JSON")
+            return
+        if isinstance(data, dict):
+            print(f"   Response type: {data.get('response_type', 'unknown')} "
+                  f"(message ID: {data.get('message_id', 'unknown')})")
+
+    def write_json_summary(self, success, stream=None):
+        """
+        Write the test result and received messages as one JSON document.
+
+        Args:
+            success (bool): Overall test result
+            stream: Text stream to write to, stdout by default
+        """
+        summary = {
+            "success": success,
+            "count": len(self.received_messages),
+            "received": [
+                {
+                    "topic": msg.topic,
+                    "payload": msg.payload.decode('utf-8', errors='replace'),
+                    "ts": msg.ts
+                }
+                for msg in self.received_messages
+            ]
+        }
+        stream = stream or sys.stdout
+        stream.flush()
+        if orjson is not None:
+            stream.buffer.write(orjson.dumps(summary, option=orjson.OPT_APPEND_NEWLINE))
+        else:
+            stream.write(json.dumps(summary) + "\n")
+        stream.flush()
+
     def run_full_test(self):
         """Run complete MQTT test suite"""
         print("🚀 Starting MQTT Broker Test Suite")
@@ -200,10 +316,11 @@ class MQTTTester:
         self.test_consultation_flow()
         
         # Show summary
+        self._drain()
         print(f"\n📊 Test Summary:")
-        print(f"   Messages received: {len(self.received_messages)}")
-        for msg in self.received_messages:
-            print(f"   - {msg['topic']}: {msg['payload'][:50]}...")
+        lines = [f"   Messages received: {len(self.received_messages)}"]
+        lines.extend(f"   - {msg.topic}: {msg.payload[:50]!r}..." for msg in self.received_messages)
+        sys.stdout.write("\n".join(lines) + "\n")
             
         print(f"\n🔌 Disconnecting...")
         self.client.loop_stop()
@@ -212,23 +329,41 @@ class MQTTTester:
         return True
 
 def main():
-    print("MQTT Broker Test for ConsultEase")
-    print("This script tests MQTT connectivity and topic permissions")
-    print(f"Broker: {MQTT_SERVER}:{MQTT_PORT}")
-    print(f"Username: {MQTT_USERNAME}")
-    print(f"Faculty ID: {FACULTY_ID}")
-    print()
-    
-    input("Press Enter to start testing... ")
-    
-    tester = MQTTTester()
-    success = tester.run_full_test()
-    
-    if success:
-        print("\n✅ MQTT test completed - check results above")
-    else:
-        print("\n❌ MQTT test failed - check broker configuration")
-        
+    # -v shows per-message publish acknowledgements, --json writes a
+    # machine-readable summary for CI as the only output on stdout
+    verbose = "-v" in sys.argv[1:]
+    json_summary = "--json" in sys.argv[1:]
+    logging.basicConfig(level=logging.DEBUG if verbose else logging.INFO,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    # With --json the human-readable report goes to stderr, so stdout can be
+    # piped straight into a JSON parser
+    json_stream = sys.stdout
+    human_output = contextlib.redirect_stdout(sys.stderr) if json_summary else contextlib.nullcontext()
+
+    with human_output:
+        print("MQTT Broker Test for ConsultEase")
+        print("This script tests MQTT connectivity and topic permissions")
+        print(f"Broker: {MQTT_SERVER}:{MQTT_PORT}{' (TLS)' if MQTT_USE_TLS else ''}")
+        print(f"Username: {MQTT_USERNAME}")
+        print(f"Faculty ID: {FACULTY_ID}")
+        print()
+
+        # Only prompt when someone is at the terminal; CI runs go straight in
+        if not json_summary and sys.stdin.isatty():
+            input("Press Enter to start testing... ")
+
+        tester = MQTTTester()
+        success = tester.run_full_test()
+
+        if success:
+            print("\n✅ MQTT test completed - check results above")
+        else:
+            print("\n❌ MQTT test failed - check broker configuration")
+
+    if json_summary:
+        tester.write_json_summary(success, json_stream)
+
     return 0 if success else 1
 
 if __name__ == "__main__":
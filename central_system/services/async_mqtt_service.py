@@ -14,6 +14,10 @@ from queue import Queue, Empty
 from typing import Dict, Callable, Optional, Any
 import paho.mqtt.client as mqtt
 
+# Imported as a module: mqtt_utils imports this service, so either of the two
+# may be imported first
+from ..utils import mqtt_utils
+
 logger = logging.getLogger(__name__)
 
 
@@ -349,20 +353,21 @@ class AsyncMQTTService:
 
         Args:
             topic: MQTT topic
-            data: Data to publish (will be JSON encoded if not string)
+            data: Data to publish (JSON encoded here unless str or bytes)
             qos: Quality of service level
             retain: Whether to retain the message
             batch: Whether to use message batching for performance
         """
-        message = {
-            'topic': topic,
-            'data': data,
-            'qos': qos,
-            'retain': retain,
-            'timestamp': time.time()
-        }
-
         try:
+            # Encode on the caller's thread so the publish worker only does I/O
+            message = {
+                'topic': topic,
+                'payload': mqtt_utils.encode_mqtt_payload(data),
+                'qos': qos,
+                'retain': retain,
+                'timestamp': time.time()
+            }
+
             # Use batching for better performance if enabled
             if batch and qos <= 1 and not retain:  # Only batch non-critical messages
                 self._add_to_batch(message)
@@ -452,16 +457,10 @@ class AsyncMQTTService:
                     self.publish_errors += 1
                     continue
 
-                # Prepare payload
-                if isinstance(message['data'], str):
-                    payload = message['data']
-                else:
-                    payload = json.dumps(message['data'])
-
-                # Publish message
+                # Publish message, encoded by publish_async()
                 result = self.client.publish(
                     message['topic'],
-                    payload,
+                    message['payload'],
                     qos=message['qos'],
                     retain=message['retain']
                 )
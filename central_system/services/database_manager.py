@@ -192,13 +192,16 @@ class DatabaseManager:
         raise DatabaseConnectionError(f"Unable to get database session after {max_retries} attempts: {last_error}")
 
     @contextmanager
-    def get_session_context(self, force_new: bool = False, max_retries: int = 3):
+    def get_session_context(self, force_new: bool = False, max_retries: int = 3, readonly: bool = False):
         """
         Context manager for database sessions with automatic cleanup.
 
         Args:
             force_new: Force creation of new session
             max_retries: Maximum retry attempts
+            readonly: Run the session as a read-only transaction. On PostgreSQL
+                the transaction is declared READ ONLY; on every backend it is
+                rolled back instead of committed on exit.
 
         Yields:
             Session: Database session
@@ -206,8 +209,13 @@ class DatabaseManager:
         session = None
         try:
             session = self.get_session(force_new=force_new, max_retries=max_retries)
+            if readonly and self.engine.dialect.name == 'postgresql':
+                session.execute(text("SET TRANSACTION READ ONLY"))
             yield session
-            session.commit()
+            if readonly:
+                session.rollback()
+            else:
+                session.commit()
         except Exception as e:
             if session:
                 session.rollback()
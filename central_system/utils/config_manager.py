@@ -69,7 +69,8 @@ class ConfigManager:
             'enable_ui_batching': True,
             'enable_smart_refresh': True,
             'max_cache_size': 1000,
-            'ui_update_timeout': 5000  # 5 seconds
+            'ui_update_timeout': 5000,  # 5 seconds
+            'verify_faculty_commits': False  # Re-read faculty status after each commit
         }
     }
     
@@ -114,6 +115,7 @@ class ConfigManager:
             'CONSULTEASE_CACHE_ENABLED': ('performance', 'enable_caching'),
             'CONSULTEASE_UI_BATCHING': ('performance', 'enable_ui_batching'),
             'CONSULTEASE_SMART_REFRESH': ('performance', 'enable_smart_refresh'),
+            'CONSULTEASE_VERIFY_FACULTY_COMMITS': ('performance', 'verify_faculty_commits'),
         }
         
         for env_var, (section, key) in env_mappings.items():
@@ -4,6 +4,7 @@ Provides common database operations with retry logic.
 """
 import logging
 import functools
+import time
 from sqlalchemy.exc import SQLAlchemyError
 from ..models.base import db_operation_with_retry
 
@@ -186,9 +187,6 @@ def atomic_operation(max_retries=3, retry_delay=0.1):
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            import time
-            import functools
-
             last_error = None
 
             for attempt in range(max_retries):
@@ -274,8 +272,6 @@ def safe_execute_with_retry(db, operation, max_retries=3):
     Returns:
         tuple: (success, result_or_error)
     """
-    import time
-
     for attempt in range(max_retries):
         try:
             result = operation(db)
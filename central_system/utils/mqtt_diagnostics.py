@@ -80,13 +80,14 @@ class MQTTDiagnostics:
         logger.info("🗄️ Testing database connectivity...")
         
         try:
+            from sqlalchemy import text
             from ..services.database_manager import get_database_manager
             db_manager = get_database_manager()
             
             # Test database connection
             with db_manager.get_session_context() as db:
                 # Simple query to test connection
-                result = db.execute("SELECT 1").fetchone()
+                result = db.execute(text("SELECT 1")).fetchone()
                 if result:
                     logger.info("✅ Database connection successful")
                 else:
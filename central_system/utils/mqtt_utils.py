@@ -6,11 +6,66 @@ Provides convenient access to the async MQTT service.
 import logging
 import json
 import inspect
-from typing import Any, Optional
-from ..services.async_mqtt_service import get_async_mqtt_service
+import threading
+from typing import Any, Iterable, Optional, Tuple, Union
+# Imported as a module: async_mqtt_service uses this module's encoder, so
+# either of the two may be imported first
+from ..services import async_mqtt_service
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Serializes direct client publishes so a batch reaches the client contiguously
+_publish_lock = threading.Lock()
+
+
+def encode_mqtt_payload(payload: Any) -> Union[str, bytes]:
+    """
+    Encode a payload for publishing.
+
+    JSON values (dicts, lists, tuples, numbers, booleans and None) are JSON
+    encoded with orjson when it is installed, falling back to the standard
+    json module. Strings and already encoded bytes are passed through, so a
+    payload published to several topics can be encoded once up front. Any
+    other object is published as its str().
+
+    Args:
+        payload: Data to publish
+
+    Returns:
+        str or bytes: Encoded message
+    """
+    if isinstance(payload, (str, bytes, bytearray)):
+        return payload
+    if payload is None or isinstance(payload, (dict, list, tuple, int, float)):
+        if orjson is not None:
+            # Non-string dict keys are stringified, as json.dumps does
+            return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(payload)
+    return str(payload)
+
+
+def decode_mqtt_payload(data: Union[str, bytes]) -> Any:
+    """
+    Decode a JSON MQTT payload.
+
+    Uses orjson when it is installed, falling back to the standard json
+    module. Both raise json.JSONDecodeError on invalid input.
+
+    Args:
+        data: JSON text or bytes
+
+    Returns:
+        Decoded payload
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 def get_mqtt_service():
     """
@@ -19,7 +74,7 @@ def get_mqtt_service():
     Returns:
         AsyncMQTTService: The global async MQTT service instance
     """
-    return get_async_mqtt_service()
+    return async_mqtt_service.get_async_mqtt_service()
 
 
 def publish_mqtt_message(topic: str, payload: any, qos: int = 0, retain: bool = False) -> bool:
@@ -37,17 +92,15 @@ def publish_mqtt_message(topic: str, payload: any, qos: int = 0, retain: bool =
         bool: True if message was queued successfully, False otherwise
     """
     from .mqtt_topics import MQTTTopics
-    client = get_async_mqtt_service().client
+    client = get_mqtt_service().client
     publish_successful = False
 
     if client and client.is_connected():
         try:
-            if isinstance(payload, dict) or isinstance(payload, list):
-                message_str = json.dumps(payload)
-            else:
-                message_str = str(payload)
-            
-            result = client.publish(topic, message_str, qos=qos, retain=retain)
+            message_str = encode_mqtt_payload(payload)
+
+            with _publish_lock:
+                result = client.publish(topic, message_str, qos=qos, retain=retain)
             
             if result.rc == 0:
                 publish_successful = True
@@ -102,6 +155,49 @@ def publish_mqtt_message(topic: str, payload: any, qos: int = 0, retain: bool =
     return publish_successful
 
 
+def publish_mqtt_batch(messages: Iterable[Tuple], qos: int = 0) -> int:
+    """
+    Publish several messages in a single pass over the MQTT client.
+
+    All payloads are encoded up front and the client is held once for the
+    whole batch, so the messages go out back-to-back and in order.
+
+    Args:
+        messages: Iterable of (topic, payload, retain) or
+            (topic, payload, retain, qos) tuples
+        qos: Quality of service level for messages that don't set their own
+
+    Returns:
+        int: Number of messages accepted by the client
+    """
+    client = get_mqtt_service().client
+    if not client or not client.is_connected():
+        logger.warning("MQTT client not available or not connected. Cannot publish batch")
+        return 0
+
+    encoded = [
+        (topic, encode_mqtt_payload(payload), retain, message_qos[0] if message_qos else qos)
+        for topic, payload, retain, *message_qos in messages
+    ]
+
+    published = 0
+    with _publish_lock:
+        for topic, message_str, retain, message_qos in encoded:
+            try:
+                result = client.publish(topic, message_str, qos=message_qos, retain=retain)
+            except Exception as e:
+                logger.error(f"Exception during MQTT batch publish to {topic}: {str(e)}")
+                continue
+
+            if result.rc == 0:
+                published += 1
+            else:
+                logger.error(f"Failed to publish to {topic} - MQTT Error Code: {result.rc}")
+
+    logger.debug(f"Published MQTT batch: {published}/{len(encoded)} messages")
+    return published
+
+
 def subscribe_to_topic(topic: str, callback: callable) -> bool:
     """
     Subscribe to an MQTT topic with a callback function.
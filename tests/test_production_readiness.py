@@ -151,6 +151,174 @@ class TestDatabaseResilience(unittest.TestCase):
         db.close()
 
 
+class TestFacultyController(unittest.TestCase):
+    """Test faculty controller database writes."""
+
+    def setUp(self):
+        """Set up a temporary database with two faculty members."""
+        from unittest import mock
+        from central_system.models import Faculty
+        from central_system.models.base import Base
+        from central_system.services import database_manager, consultation_queue_service
+        from central_system.controllers import faculty_controller
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_manager = database_manager.DatabaseManager(
+            f"sqlite:///{os.path.join(self.temp_dir.name, 'test.db')}")
+        self.db_manager.initialize()
+        Base.metadata.create_all(self.db_manager.engine)
+
+        with self.db_manager.get_session_context() as db:
+            db.add(Faculty(name='Dr A', department='CS', email='a@example.com',
+                           ble_id='AA:BB:CC:DD:EE:01', status=False))
+            db.add(Faculty(name='Dr B', department='EE', email='b@example.com',
+                           ble_id='AA:BB:CC:DD:EE:02', status=True))
+
+        self.patches = [
+            mock.patch.object(database_manager, '_db_manager', self.db_manager),
+            mock.patch.object(consultation_queue_service, '_consultation_queue_service',
+                              consultation_queue_service.ConsultationQueueService(
+                                  db_path=os.path.join(self.temp_dir.name, 'queue.db'))),
+            mock.patch.object(faculty_controller, 'get_db',
+                              side_effect=lambda *args, **kwargs: self.db_manager.SessionLocal()),
+            mock.patch.object(faculty_controller.FacultyController,
+                              '_publish_status_update_with_sequence_safe'),
+            mock.patch.dict(faculty_controller._last_status, clear=True),
+        ]
+        for patcher in self.patches:
+            patcher.start()
+
+    def tearDown(self):
+        """Remove the temporary database."""
+        for patcher in reversed(self.patches):
+            patcher.stop()
+        self.db_manager.shutdown()
+        self.temp_dir.cleanup()
+
+    def _get_faculty(self, faculty_id):
+        """Read a faculty row straight from the database."""
+        from central_system.models import Faculty
+
+        with self.db_manager.get_session_context() as db:
+            faculty = db.get(Faculty, faculty_id)
+            db.expunge(faculty)
+            return faculty
+
+    def test_status_update_across_controllers(self):
+        """Test that a repeated status is written after another controller changed it."""
+        from central_system.controllers.faculty_controller import FacultyController
+
+        first = FacultyController()
+        second = FacultyController()
+
+        self.assertTrue(first.update_faculty_status(1, True).status)
+        self.assertFalse(second.update_faculty_status(1, False).status)
+
+        # The first controller last set True; it must not skip the write
+        self.assertTrue(first.update_faculty_status(1, True).status)
+        self.assertTrue(self._get_faculty(1).status)
+
+    def test_status_update_after_other_writer(self):
+        """Test that a remembered status is dropped when another path writes the row."""
+        from central_system.controllers.faculty_controller import FacultyController
+
+        controller = FacultyController()
+
+        self.assertTrue(controller.update_faculty_status(1, True).status)
+        controller._update_faculty_enhanced_status(1, False, 'synced', False)
+
+        self.assertTrue(controller.update_faculty_status(1, True).status)
+        self.assertTrue(self._get_faculty(1).status)
+
+    def test_status_update_reports_previous_status(self):
+        """Test that the published previous status is read from the row, including NULL."""
+        from central_system.models import Faculty
+        from central_system.controllers.faculty_controller import FacultyController
+
+        with self.db_manager.get_session_context() as db:
+            db.get(Faculty, 1).status = None
+
+        controller = FacultyController()
+        publish = FacultyController._publish_status_update_with_sequence_safe
+
+        self.assertFalse(controller.update_faculty_status(1, False).status)
+        self.assertEqual(publish.call_args.args[1:], (False, None))
+
+        self.assertTrue(controller.update_faculty_status(1, True).status)
+        self.assertEqual(publish.call_args.args[1:], (True, False))
+
+    def test_repeated_status_update_is_noop(self):
+        """Test that repeating the current status does not write the row."""
+        from central_system.controllers.faculty_controller import FacultyController
+
+        controller = FacultyController()
+        version = self._get_faculty(2).version
+
+        snapshot = controller.update_faculty_status(2, True)
+
+        self.assertTrue(snapshot.status)
+        self.assertEqual(self._get_faculty(2).version, version)
+        # The repeat is answered without another database round trip
+        self.assertIs(controller.update_faculty_status(2, True), snapshot)
+        self.assertIsNone(controller.update_faculty_status(999, True))
+
+    def test_noop_faculty_update_keeps_updated_at(self):
+        """Test that an update with unchanged values does not write the row."""
+        from central_system.models import Faculty
+        from central_system.controllers.faculty_controller import FacultyController
+
+        updated_at = datetime(2024, 1, 1, 8, 0, 0)
+        with self.db_manager.get_session_context() as db:
+            db.get(Faculty, 1).updated_at = updated_at
+
+        faculty = FacultyController().update_faculty(1, name='Dr A', department='CS')
+
+        self.assertIsNotNone(faculty)
+        self.assertEqual(faculty.id, 1)
+        self.assertEqual(self._get_faculty(1).updated_at, updated_at)
+
+    def test_faculty_update_rejects_duplicates(self):
+        """Test that updates claiming another faculty's email or BLE ID fail."""
+        from central_system.controllers.faculty_controller import FacultyController
+
+        controller = FacultyController()
+
+        self.assertIsNone(controller.update_faculty(1, email='b@example.com'))
+        self.assertIsNone(controller.update_faculty(1, ble_id='AA:BB:CC:DD:EE:02'))
+        self.assertFalse(controller.update_faculty_ble_id(1, 'AA:BB:CC:DD:EE:02'))
+
+        faculty = self._get_faculty(1)
+        self.assertEqual(faculty.email, 'a@example.com')
+        self.assertEqual(faculty.ble_id, 'AA:BB:CC:DD:EE:01')
+
+    def test_faculty_update_missing_id(self):
+        """Test that updating a faculty ID that does not exist fails."""
+        from central_system.controllers.faculty_controller import FacultyController
+
+        controller = FacultyController()
+
+        self.assertIsNone(controller.update_faculty(999, name='Dr Z'))
+        self.assertFalse(controller.update_faculty_ble_id(999, 'AA:BB:CC:DD:EE:09'))
+
+    def test_heartbeat_flush(self):
+        """Test that a heartbeat flush writes last_seen for every buffered faculty."""
+        from central_system.controllers.faculty_controller import FacultyController
+
+        controller = FacultyController()
+        seen = {
+            1: datetime(2024, 1, 1, 9, 0, 0),
+            2: datetime(2024, 1, 1, 9, 0, 5),
+            999: datetime(2024, 1, 1, 9, 0, 10),  # Unknown faculty, ignored
+        }
+        controller._hb_buffer = dict(seen)
+
+        controller._flush_heartbeats()
+
+        self.assertEqual(controller._hb_buffer, {})
+        self.assertEqual(self._get_faculty(1).last_seen, seen[1])
+        self.assertEqual(self._get_faculty(2).last_seen, seen[2])
+
+
 class TestMQTTPerformance(unittest.TestCase):
     """Test MQTT service performance features."""
     
@@ -188,6 +356,47 @@ class TestMQTTPerformance(unittest.TestCase):
         for key in expected_keys:
             self.assertIn(key, stats)
 
+    def test_mqtt_payload_encoding(self):
+        """Test that payloads with non-string dict keys encode like json.dumps."""
+        from central_system.utils.mqtt_utils import encode_mqtt_payload, decode_mqtt_payload
+
+        payload = {1: "faculty", "status": True, "extra": None}
+        encoded = encode_mqtt_payload(payload)
+
+        self.assertEqual(decode_mqtt_payload(encoded), {"1": "faculty", "status": True, "extra": None})
+        self.assertEqual(encode_mqtt_payload("plain text"), "plain text")
+
+    def test_mqtt_tester_json_output(self):
+        """Test that the broker tester writes only the JSON summary to stdout with --json."""
+        import io
+        import json
+        from unittest import mock
+        from central_system import mqtt_broker_test
+        from central_system.mqtt_broker_test import MQTTTester
+
+        def connect(tester):
+            print("Connected to MQTT broker")
+            tester._rx_q.put((mqtt_broker_test.RESPONSE_TOPIC, b'{"response_type": "ACKNOWLEDGE"}',
+                              1, False, time.time()))
+            return True
+
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+        stderr = io.StringIO()
+        with mock.patch.object(sys, 'argv', ['mqtt_broker_test.py', '--json']), \
+                mock.patch.object(sys, 'stdout', stdout), \
+                mock.patch.object(sys, 'stderr', stderr), \
+                mock.patch.object(MQTTTester, 'connect', autospec=True, side_effect=connect), \
+                mock.patch.object(MQTTTester, 'test_faculty_topics'), \
+                mock.patch.object(MQTTTester, 'test_consultation_flow'):
+            self.assertEqual(mqtt_broker_test.main(), 0)
+
+        stdout.flush()
+        summary = json.loads(stdout.buffer.getvalue())
+        self.assertTrue(summary['success'])
+        self.assertEqual(summary['count'], 1)
+        self.assertEqual(summary['received'][0]['topic'], mqtt_broker_test.RESPONSE_TOPIC)
+        self.assertIn("Test Summary", stderr.getvalue())
+
 
 class TestHardwareValidation(unittest.TestCase):
     """Test hardware validation functionality."""
@@ -379,6 +588,7 @@ def run_production_tests():
     test_classes = [
         TestSecurityFeatures,
         TestDatabaseResilience,
+        TestFacultyController,
         TestMQTTPerformance,
         TestHardwareValidation,
         TestSystemMonitoring,